@@ -5,13 +5,92 @@ Uses raw JSON-RPC calls via httpx (no web3 dependency needed).
 Also checks token allowances for Polymarket exchange contracts.
 """
 
+import asyncio
+import atexit
+import functools
+import threading
+import time
+
 import httpx
+import orjson
 import structlog
-from eth_account import Account
 from config import config
+from wallet import signer
 
 log = structlog.get_logger()
 
+# Shared client — keeps TLS sessions alive across RPC calls instead of
+# paying a fresh TCP+TLS handshake per request.
+_HTTP = httpx.Client(
+    timeout=3,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=8),
+)
+atexit.register(_HTTP.close)
+
+# The hedged path is async, and its connections only get reused if the
+# client and its event loop outlive individual calls — asyncio.run would
+# tear both down every time. A dedicated loop on a daemon thread hosts a
+# single AsyncClient; _hedged_post bridges synchronous callers into it.
+_ASYNC_LOOP = asyncio.new_event_loop()
+threading.Thread(target=_ASYNC_LOOP.run_forever, name="rpc-loop", daemon=True).start()
+_ASYNC_HTTP = httpx.AsyncClient(
+    timeout=3,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=8),
+)
+
+
+def _shutdown_async_rpc():
+    try:
+        asyncio.run_coroutine_threadsafe(_ASYNC_HTTP.aclose(), _ASYNC_LOOP).result(
+            timeout=3
+        )
+    except Exception:
+        pass
+    _ASYNC_LOOP.call_soon_threadsafe(_ASYNC_LOOP.stop)
+
+
+atexit.register(_shutdown_async_rpc)
+
+
+def _hedged_post(payload, expected: int | None):
+    """Run a hedged POST on the persistent RPC loop and wait for the result."""
+    return asyncio.run_coroutine_threadsafe(
+        _hedged_post_async(payload, expected), _ASYNC_LOOP
+    ).result()
+
+# Per-endpoint circuit breaker: hot-failing RPCs are skipped until their
+# backoff expires (doubling per consecutive failure, capped at 60s), so an
+# incident at one provider doesn't stall every wallet check.
+_RPC_BACKOFF_BASE = 2.0
+_RPC_BACKOFF_CAP = 60.0
+_RPC_SKIP_UNTIL: dict[str, float] = {}
+_RPC_FAILURES: dict[str, int] = {}
+
+
+def _healthy_rpc_urls() -> list[str]:
+    """Endpoints not currently in backoff (all of them if all are tripped)."""
+    now = time.monotonic()
+    urls = [u for u in POLYGON_RPC_URLS if _RPC_SKIP_UNTIL.get(u, 0.0) <= now]
+    return urls or list(POLYGON_RPC_URLS)
+
+
+def _record_rpc_failure(url: str):
+    failures = _RPC_FAILURES.get(url, 0) + 1
+    _RPC_FAILURES[url] = failures
+    backoff = min(_RPC_BACKOFF_BASE * 2 ** (failures - 1), _RPC_BACKOFF_CAP)
+    _RPC_SKIP_UNTIL[url] = time.monotonic() + backoff
+
+
+def _record_rpc_success(url: str):
+    _RPC_FAILURES.pop(url, None)
+    _RPC_SKIP_UNTIL.pop(url, None)
+
+# orjson encode/decode is several times faster than stdlib json; payloads
+# are passed pre-serialized so httpx doesn't re-encode them per endpoint.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 # Polygon USDC contracts (6 decimals)
 USDC_E_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 USDC_NATIVE_ADDRESS = "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"
@@ -27,52 +106,228 @@ NEG_RISK_ADAPTER = "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296"
 BALANCE_OF_SELECTOR = "0x70a08231"
 ALLOWANCE_SELECTOR = "0xdd62ed3e"
 
+# Pre-decoded bytes forms for hot-path calldata building (the hex string
+# constants above stay for external callers like setup_allowances.py).
+_BALANCE_OF = bytes.fromhex("70a08231")
+_ALLOWANCE = bytes.fromhex("dd62ed3e")
+
 POLYGON_RPC_URLS = [
     "https://polygon-rpc.com",
     "https://polygon.llamarpc.com",
     "https://rpc.ankr.com/polygon",
 ]
 
-
-def _rpc_call(method: str, params: list, rpc_url: str = None) -> dict:
-    """Make a raw JSON-RPC call to Polygon."""
-    urls = [rpc_url] if rpc_url else POLYGON_RPC_URLS
-
-    for url in urls:
-        try:
-            resp = httpx.post(
-                url,
-                json={"jsonrpc": "2.0", "method": method, "params": params, "id": 1},
-                timeout=10,
+# Multicall3 — same address on every major chain, including Polygon.
+# aggregate3((address,bool,bytes)[]) lets us read N contracts in one eth_call.
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = "0x82ad56cb"
+
+
+def _payload_ok(data, expected: int | None) -> bool:
+    """Validate a JSON-RPC response body (single object or batch array)."""
+    if expected is None:
+        return isinstance(data, dict) and "error" not in data
+    if not isinstance(data, list) or len(data) != expected:
+        return False
+    return all(isinstance(item, dict) and "error" not in item for item in data)
+
+
+async def _hedged_post_async(payload, expected: int | None):
+    """POST the payload to every RPC endpoint at once; first valid answer wins.
+
+    Hedging masks a slow or dead provider: instead of burning the full
+    timeout on polygon-rpc.com before trying llamarpc, latency is bounded
+    by the fastest surviving endpoint. Losing requests are cancelled.
+    """
+    body = orjson.dumps(payload)
+    task_urls = {}
+    for url in _healthy_rpc_urls():
+        task = asyncio.create_task(
+            _ASYNC_HTTP.post(url, content=body, headers=_JSON_HEADERS)
+        )
+        task_urls[task] = url
+    tasks = list(task_urls)
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
             )
-            if resp.status_code == 200:
-                data = resp.json()
-                if "error" not in data:
+            for task in done:
+                url = task_urls[task]
+                if task.exception() is not None:
+                    _record_rpc_failure(url)
+                    continue
+                resp = task.result()
+                if resp.status_code != 200:
+                    _record_rpc_failure(url)
+                    continue
+                try:
+                    data = orjson.loads(resp.content)
+                except Exception:
+                    _record_rpc_failure(url)
+                    continue
+                if _payload_ok(data, expected):
+                    _record_rpc_success(url)
                     return data
-        except Exception:
-            continue
+    finally:
+        for task in tasks:
+            task.cancel()
 
     raise ConnectionError("Could not connect to any Polygon RPC endpoint")
 
 
+def _rpc_call(method: str, params: list, rpc_url: str = None) -> dict:
+    """Make a raw JSON-RPC call to Polygon (hedged across all endpoints)."""
+    if rpc_url:
+        # Explicit endpoint requested — single direct call, no hedging
+        resp = _HTTP.post(
+            rpc_url,
+            content=orjson.dumps(
+                {"jsonrpc": "2.0", "method": method, "params": params, "id": 1}
+            ),
+            headers=_JSON_HEADERS,
+        )
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        if "error" in data:
+            raise ConnectionError(f"RPC error: {data['error']}")
+        return data
+
+    payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": 1}
+    return _hedged_post(payload, expected=None)
+
+
+def _rpc_batch(calls: list[tuple[str, list]]) -> list[dict]:
+    """Send multiple JSON-RPC calls in a single batched HTTP POST.
+
+    Polygon RPCs accept a JSON array of request objects and return an array
+    of responses (possibly out of order — match by id). Returns results in
+    the same order as `calls`. Falls back to per-call requests if every
+    provider rejects the batch.
+    """
+    payload = [
+        {"jsonrpc": "2.0", "method": method, "params": params, "id": i}
+        for i, (method, params) in enumerate(calls)
+    ]
+
+    try:
+        data = _hedged_post(payload, expected=len(calls))
+        by_id = {item.get("id"): item for item in data}
+        return [by_id[i] for i in range(len(calls))]
+    except Exception:
+        # Batch failed everywhere — fall back to individual calls
+        log.warning("rpc.batch_fallback", calls=len(calls))
+        return [_rpc_call(method, params) for method, params in calls]
+
+
 def _eth_call(to: str, data: str) -> str:
     """Execute eth_call and return the hex result."""
     result = _rpc_call("eth_call", [{"to": to, "data": data}, "latest"])
     return result.get("result", "0x0")
 
 
+def _eth_call_batch(calls: list[tuple[str, str]]) -> list[str]:
+    """Execute multiple eth_calls in one batched request.
+
+    `calls` is a list of (to, data) pairs; returns hex results in order.
+    """
+    results = _rpc_batch(
+        [("eth_call", [{"to": to, "data": data}, "latest"]) for to, data in calls]
+    )
+    return [r.get("result", "0x0") for r in results]
+
+
+def _multicall3(calls: list[tuple[str, str]]) -> list[str]:
+    """Read N contracts in a single eth_call via Multicall3.aggregate3.
+
+    `calls` is a list of (to, data) pairs. Returns hex results (without the
+    "0x" stripped) in order; a failed sub-call yields "0x0". Falls back to a
+    batched JSON-RPC request if the Multicall3 call itself fails.
+
+    The Call3[] argument is ABI-encoded by hand (offset table + per-tuple
+    heads/tails) to avoid pulling in eth_abi for one fixed shape.
+    """
+    try:
+        # Each Call3 tuple: (address target, bool allowFailure, bytes callData)
+        tails = []
+        for to, data in calls:
+            calldata = bytes.fromhex(data[2:] if data.startswith("0x") else data)
+            padded_len = (len(calldata) + 31) // 32 * 32
+            tails.append(
+                _addr32(to)                                  # target
+                + (1).to_bytes(32, "big")                    # allowFailure = true
+                + (0x60).to_bytes(32, "big")                 # offset to bytes
+                + len(calldata).to_bytes(32, "big")          # bytes length
+                + calldata.ljust(padded_len, b"\x00")        # padded calldata
+            )
+
+        # Dynamic array: offset to array, length, per-element offsets, elements
+        n = len(tails)
+        head = (0x20).to_bytes(32, "big") + n.to_bytes(32, "big")
+        offsets = b""
+        running = 32 * n  # element offsets are relative to start of element area
+        for tail in tails:
+            offsets += running.to_bytes(32, "big")
+            running += len(tail)
+        encoded = AGGREGATE3_SELECTOR + (head + offsets + b"".join(tails)).hex()
+
+        raw = _eth_call(MULTICALL3, encoded)
+        blob = bytes.fromhex(raw[2:] if raw.startswith("0x") else raw)
+
+        # Decode Result[] = (bool success, bytes returnData)[]
+        array_pos = int.from_bytes(blob[0:32], "big")
+        length = int.from_bytes(blob[array_pos : array_pos + 32], "big")
+        if length != n:
+            raise ValueError(f"Multicall3 returned {length} results, expected {n}")
+
+        results = []
+        elems_base = array_pos + 32
+        for i in range(n):
+            elem_off = int.from_bytes(blob[elems_base + 32 * i : elems_base + 32 * (i + 1)], "big")
+            elem = elems_base + elem_off
+            success = int.from_bytes(blob[elem : elem + 32], "big")
+            data_off = int.from_bytes(blob[elem + 32 : elem + 64], "big")
+            data_pos = elem + data_off
+            data_len = int.from_bytes(blob[data_pos : data_pos + 32], "big")
+            ret = blob[data_pos + 32 : data_pos + 32 + data_len]
+            results.append("0x" + ret.hex() if success and ret else "0x0")
+        return results
+
+    except Exception as e:
+        log.warning("rpc.multicall_fallback", error=str(e), calls=len(calls))
+        return _eth_call_batch(calls)
+
+
+@functools.lru_cache(maxsize=32)
 def _encode_address(addr: str) -> str:
-    """ABI-encode an address (pad to 32 bytes)."""
-    return addr.lower().replace("0x", "").zfill(64)
+    """ABI-encode an address (pad to 32 bytes).
+
+    One C-level int parse + format instead of lower/replace/zfill, and
+    memoized — callers only ever encode a handful of distinct addresses.
+    """
+    return f"{int(addr, 16):064x}"
 
 
+@functools.lru_cache(maxsize=1)
 def _get_wallet_address() -> str:
     """Derive wallet address from private key or use funder address."""
     if config.funder_address:
         return config.funder_address
 
-    account = Account.from_key(config.private_key)
-    return account.address
+    return signer().address
+
+
+@functools.lru_cache(maxsize=16)
+def _addr32(addr: str) -> bytes:
+    """Address as a left-padded 32-byte ABI word."""
+    return bytes.fromhex(addr[2:] if addr.startswith("0x") else addr).rjust(32, b"\x00")
+
+
+@functools.lru_cache(maxsize=1)
+def _owner32() -> bytes:
+    """The wallet address pre-padded to 32 bytes for calldata building."""
+    return _addr32(_get_wallet_address())
 
 
 def get_usdc_balance() -> float:
@@ -80,11 +335,17 @@ def get_usdc_balance() -> float:
     address = _get_wallet_address()
     total = 0.0
 
-    for usdc_addr in [USDC_E_ADDRESS, USDC_NATIVE_ADDRESS]:
+    # balanceOf(address) call — same calldata for both tokens, one batched POST
+    call_data = "0x" + (_BALANCE_OF + _owner32()).hex()
+    contracts = [USDC_E_ADDRESS, USDC_NATIVE_ADDRESS]
+    try:
+        results = _multicall3([(addr, call_data) for addr in contracts])
+    except Exception as e:
+        log.warning("balance.usdc_check_failed", error=str(e))
+        results = ["0x0"] * len(contracts)
+
+    for usdc_addr, result in zip(contracts, results):
         try:
-            # balanceOf(address) call
-            call_data = BALANCE_OF_SELECTOR + _encode_address(address)
-            result = _eth_call(usdc_addr, call_data)
             raw_balance = int(result, 16)
             balance = raw_balance / 1e6  # USDC has 6 decimals
             total += balance
@@ -101,29 +362,46 @@ def check_allowances() -> dict[str, bool]:
     results = {}
     threshold = 2**128  # consider "approved" if allowance > this
 
-    for usdc_label, usdc_addr in [("USDC.e", USDC_E_ADDRESS), ("USDC", USDC_NATIVE_ADDRESS)]:
-        for exchange_label, exchange_addr in [
+    # Build the full USDC × exchange cross product up front, then fetch all
+    # six allowances in one Multicall3 eth_call (one RPC, one EVM entry).
+    # allowance(owner, spender) calldata only varies by spender, so encode
+    # each spender's calldata once and reuse it for both USDC tokens.
+    prefix = _ALLOWANCE + _owner32()
+    spender_data = {
+        label: "0x" + (prefix + _addr32(addr)).hex()
+        for label, addr in [
             ("CTF_EXCHANGE", CTF_EXCHANGE),
             ("NEG_RISK_CTF", NEG_RISK_CTF_EXCHANGE),
             ("NEG_RISK_ADAPTER", NEG_RISK_ADAPTER),
-        ]:
-            key = f"{usdc_label}->{exchange_label}"
-            try:
-                # allowance(owner, spender) call
-                call_data = (
-                    ALLOWANCE_SELECTOR
-                    + _encode_address(address)
-                    + _encode_address(exchange_addr)
-                )
-                result = _eth_call(usdc_addr, call_data)
-                allowance_val = int(result, 16)
-                approved = allowance_val > threshold
-                results[key] = approved
-                if not approved:
-                    log.warning("allowance.not_set", pair=key)
-            except Exception as e:
-                results[key] = False
-                log.error("allowance.check_failed", pair=key, error=str(e))
+        ]
+    }
+
+    checks = []  # (key, usdc_addr, call_data)
+    for usdc_label, usdc_addr in [("USDC.e", USDC_E_ADDRESS), ("USDC", USDC_NATIVE_ADDRESS)]:
+        for exchange_label, call_data in spender_data.items():
+            checks.append((f"{usdc_label}->{exchange_label}", usdc_addr, call_data))
+
+    try:
+        raw_results = _multicall3([(addr, data) for _, addr, data in checks])
+    except Exception as e:
+        log.error("allowance.check_failed", error=str(e))
+        return {key: False for key, _, _ in checks}
+
+    for (key, _, _), result in zip(checks, raw_results):
+        try:
+            # Fast path: an approved token has a near-max-uint allowance, so
+            # any nonzero digit in the upper 128 bits means approved without
+            # paying for a 256-bit int parse. Fall back to int() otherwise.
+            if len(result) >= 66 and result[2:34] != "0" * 32:
+                approved = True
+            else:
+                approved = int(result, 16) > threshold
+            results[key] = approved
+            if not approved:
+                log.warning("allowance.not_set", pair=key)
+        except Exception as e:
+            results[key] = False
+            log.error("allowance.check_failed", pair=key, error=str(e))
 
     return results
 
@@ -5,7 +5,11 @@ Data Enrichment: Fetches external data to give Claude better context.
 - Crypto: on-chain metrics, sentiment signals
 """
 
+import asyncio
+import time
 import httpx
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import structlog
 from datetime import datetime, timezone
 from scanner import ScannedMarket
@@ -18,19 +22,56 @@ class DataEnricher:
     """Enriches markets with external data before sending to Claude."""
 
     def __init__(self):
-        self.client = httpx.Client(timeout=15)
+        self.client = httpx.Client(timeout=15, http2=True)
+        self._noaa_headers = {"User-Agent": "polymarket-agent/1.0"}
+        # O(1) category dispatch — enrich() runs once per market per scan
+        self._handlers = {
+            "weather": self._enrich_weather,
+            "sports": self._enrich_sports,
+            "crypto": self._enrich_crypto,
+        }
+        # Short-TTL cache: these feeds change on minute timescales, but a
+        # scan can hit enrich() for dozens of markets in the same category.
+        self._cache: dict[str, tuple[float, str]] = {}
+
+    def _cached(self, key: str, ttl: float, fn) -> str:
+        """Return the cached value for key if younger than ttl, else fetch."""
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < ttl:
+            return hit[1]
+        value = fn()
+        self._cache[key] = (now, value)
+        return value
+
+    def enrich_batch(self, markets: list[ScannedMarket]) -> dict[str, str]:
+        """Enrich many markets up front, keyed by slug.
+
+        The underlying feeds are per-category, so one representative market
+        per category is fetched concurrently to warm the caches; the rest
+        of the markets then resolve from cache without touching the network.
+        Called once per cycle so enrichment never sits on the per-estimate
+        critical path.
+        """
+        if not markets:
+            return {}
+
+        representatives = {}
+        for m in markets:
+            representatives.setdefault(m.category, m)
+
+        with ThreadPoolExecutor(max_workers=len(representatives)) as pool:
+            list(pool.map(self.enrich, representatives.values()))
+
+        return {m.slug: self.enrich(m) for m in markets}
 
     def enrich(self, market: ScannedMarket) -> str:
         """Returns extra context string for the given market category."""
+        handler = self._handlers.get(market.category)
+        if handler is None:
+            return ""
         try:
-            if market.category == "weather":
-                return self._enrich_weather(market)
-            elif market.category == "sports":
-                return self._enrich_sports(market)
-            elif market.category == "crypto":
-                return self._enrich_crypto(market)
-            else:
-                return ""
+            return handler(market)
         except Exception as e:
             log.warning("enrichment.failed", category=market.category, error=str(e))
             return ""
@@ -43,38 +84,66 @@ class DataEnricher:
         # Extract location from question (simplified — production would use NER)
         question = market.question.lower()
 
-        # Example: get national forecast discussion
+        # Example: get national forecast discussion.
+        # Forecast discussions update slowly — cache for 30 minutes.
         try:
-            resp = self.client.get(
-                "https://api.weather.gov/products/types/AFD",
-                headers={"User-Agent": "polymarket-agent/1.0"},
+            return self._cached(
+                "noaa_afd", 1800.0, lambda: asyncio.run(self._fetch_weather_async())
             )
-            if resp.status_code == 200:
-                products = resp.json().get("@graph", [])[:3]
-                discussions = []
-                for p in products:
-                    detail = self.client.get(
-                        p.get("@id", ""),
-                        headers={"User-Agent": "polymarket-agent/1.0"},
-                    )
-                    if detail.status_code == 200:
-                        text = detail.json().get("productText", "")[:2000]
-                        discussions.append(text)
-                return (
-                    "[NOAA FORECAST DATA]\n"
-                    + "\n---\n".join(discussions)
-                    + "\n[END NOAA DATA]"
-                )
         except Exception as e:
             log.warning("noaa.fetch_failed", error=str(e))
 
         return ""
 
+    async def _fetch_weather_async(self) -> str:
+        """Fetch the AFD product list, then all product details concurrently."""
+        headers = self._noaa_headers
+        async with httpx.AsyncClient(timeout=15, http2=True) as client:
+            resp = await client.get(
+                "https://api.weather.gov/products/types/AFD",
+                headers=headers,
+            )
+            if resp.status_code != 200:
+                return ""
+
+            products = orjson.loads(resp.content).get("@graph", [])[:3]
+            # Ask for the raw text view — we only keep 2000 chars of the
+            # productText field, so skip the (much larger) JSON body+parse.
+            text_headers = {**headers, "Accept": "text/plain"}
+            details = await asyncio.gather(
+                *[client.get(p.get("@id", ""), headers=text_headers) for p in products],
+                return_exceptions=True,
+            )
+
+        discussions = []
+        for detail in details:
+            if isinstance(detail, Exception) or detail.status_code != 200:
+                continue
+            content_type = detail.headers.get("content-type", "")
+            if "json" in content_type:
+                # Server ignored the Accept header — fall back to JSON
+                text = orjson.loads(detail.content).get("productText", "")[:2000]
+            else:
+                text = detail.text[:2000]
+            discussions.append(text)
+        return (
+            "[NOAA FORECAST DATA]\n"
+            + "\n---\n".join(discussions)
+            + "\n[END NOAA DATA]"
+        )
+
     # -------------------------------------------------------------------------
     # Sports: Public injury / news feeds
     # -------------------------------------------------------------------------
     def _enrich_sports(self, market: ScannedMarket) -> str:
-        """Scrape publicly available injury reports and recent results."""
+        """Scrape publicly available injury reports and recent results.
+
+        Cached for 2 minutes — injury feeds move on minute timescales, and
+        a scan can carry dozens of sports markets that all share the feed.
+        """
+        return self._cached("sports_injuries", 120.0, self._fetch_sports)
+
+    def _fetch_sports(self) -> str:
         # Use a free sports API or ESPN public endpoints
         try:
             # ESPN has public endpoints for scores and injuries
@@ -84,7 +153,7 @@ class DataEnricher:
                 timeout=10,
             )
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 injuries = []
                 for team in data.get("items", [])[:5]:
                     team_name = team.get("team", {}).get("displayName", "")
@@ -107,14 +176,44 @@ class DataEnricher:
     # Crypto: On-chain metrics + fear/greed
     # -------------------------------------------------------------------------
     def _enrich_crypto(self, market: ScannedMarket) -> str:
-        """Fetch on-chain metrics and sentiment for crypto markets."""
+        """Fetch on-chain metrics and sentiment for crypto markets.
+
+        Cached for 60 seconds — one set of fetches per minute, however many
+        crypto markets are in the scan.
+        """
+        return self._cached("crypto", 60.0, self._fetch_crypto)
+
+    def _fetch_crypto(self) -> str:
+        try:
+            signals = asyncio.run(self._fetch_crypto_async())
+        except Exception as e:
+            log.warning("crypto.fetch_failed", error=str(e))
+            signals = []
+
+        if signals:
+            return "[CRYPTO SIGNALS]\n" + "\n".join(signals) + "\n[END CRYPTO SIGNALS]"
+        return ""
+
+    async def _fetch_crypto_async(self) -> list[str]:
+        """Fetch the three independent crypto feeds concurrently."""
+        async with httpx.AsyncClient(timeout=15, http2=True) as client:
+            fng_resp, price_resp, mempool_resp = await asyncio.gather(
+                client.get("https://api.alternative.me/fng/?limit=1"),
+                client.get(
+                    "https://api.coingecko.com/api/v3/simple/price",
+                    params={"ids": "bitcoin,ethereum", "vs_currencies": "usd",
+                            "include_24hr_change": "true"},
+                ),
+                client.get("https://api.blockchain.info/mempool?timespan=1hours&format=json"),
+                return_exceptions=True,
+            )
+
         signals = []
 
         # Fear & Greed Index (free API)
         try:
-            resp = self.client.get("https://api.alternative.me/fng/?limit=1")
-            if resp.status_code == 200:
-                fng = resp.json()["data"][0]
+            if not isinstance(fng_resp, Exception) and fng_resp.status_code == 200:
+                fng = orjson.loads(fng_resp.content)["data"][0]
                 signals.append(
                     f"Fear & Greed Index: {fng['value']} ({fng['value_classification']})"
                 )
@@ -123,13 +222,8 @@ class DataEnricher:
 
         # Bitcoin price from CoinGecko (free, no key needed)
         try:
-            resp = self.client.get(
-                "https://api.coingecko.com/api/v3/simple/price",
-                params={"ids": "bitcoin,ethereum", "vs_currencies": "usd",
-                        "include_24hr_change": "true"},
-            )
-            if resp.status_code == 200:
-                data = resp.json()
+            if not isinstance(price_resp, Exception) and price_resp.status_code == 200:
+                data = orjson.loads(price_resp.content)
                 for coin in ["bitcoin", "ethereum"]:
                     if coin in data:
                         price = data[coin]["usd"]
@@ -140,15 +234,12 @@ class DataEnricher:
 
         # Blockchain.com mempool (Bitcoin)
         try:
-            resp = self.client.get("https://api.blockchain.info/mempool?timespan=1hours&format=json")
-            if resp.status_code == 200:
-                mempool = resp.json()
+            if not isinstance(mempool_resp, Exception) and mempool_resp.status_code == 200:
+                mempool = orjson.loads(mempool_resp.content)
                 if mempool.get("values"):
                     latest = mempool["values"][-1]
                     signals.append(f"BTC mempool transactions: {latest.get('y', 'N/A')}")
         except Exception:
             pass
 
-        if signals:
-            return "[CRYPTO SIGNALS]\n" + "\n".join(signals) + "\n[END CRYPTO SIGNALS]"
-        return ""
+        return signals
@@ -13,8 +13,14 @@ Key API facts (from Polymarket docs):
 - Price must be between 0.01 and 0.99
 """
 
+import hashlib
+import json
+import os
+import numpy as np
 import structlog
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import (
     MarketOrderArgs,
@@ -29,6 +35,43 @@ from config import config
 
 log = structlog.get_logger()
 
+# API creds are deterministic from the private key, so they can be cached
+# across restarts instead of re-deriving (one HTTP round-trip + signing).
+CREDS_CACHE_DIR = Path.home() / ".cache" / "polymarket-agent"
+
+
+class _PooledRequests:
+    """requests-module stand-in that routes HTTP through a keep-alive Session.
+
+    py_clob_client's http_helpers call module-level requests.* functions AND
+    reference the module's exception classes (requests.RequestException,
+    requests.JSONDecodeError) in their except clauses — so a bare Session
+    can't be swapped in for the module. Only the verb functions are
+    overridden here; every other attribute resolves from the real module,
+    keeping the helpers' error handling intact.
+    """
+
+    _VERBS = frozenset(
+        ("request", "get", "post", "put", "patch", "delete", "head", "options")
+    )
+
+    def __init__(self, session):
+        self._session = session
+
+    def __getattr__(self, name):
+        if name in self._VERBS:
+            return getattr(self._session, name)
+        import requests
+        return getattr(requests, name)
+
+
+def _creds_cache_path() -> Path:
+    """Cache file keyed by wallet + chain so key rotation invalidates it."""
+    digest = hashlib.sha256(
+        f"{config.private_key}:{config.chain_id}".encode()
+    ).hexdigest()[:16]
+    return CREDS_CACHE_DIR / f"creds-{digest}.json"
+
 
 @dataclass
 class ExecutionResult:
@@ -53,52 +96,128 @@ class TradeExecutor:
             kwargs["funder"] = config.funder_address
 
         self.client = ClobClient(**kwargs)
+        self._install_pooled_session()
 
         # Derive API credentials (deterministic from private key — only need to do once)
         try:
-            creds = self.client.create_or_derive_api_creds()
+            creds = self._load_cached_creds()
+            if creds is None:
+                creds = self.client.create_or_derive_api_creds()
+                self._save_cached_creds(creds)
             self.client.set_api_creds(creds)
             log.info("executor.initialized", msg="API credentials set")
         except Exception as e:
             log.error("executor.creds_failed", error=str(e))
             raise
 
-    def execute(self, signal: TradeSignal) -> ExecutionResult:
-        """Execute a single trade signal as a Fill-or-Kill market order."""
+    def _install_pooled_session(self):
+        """Route the CLOB client's HTTP through a pooled requests.Session.
 
-        log.info(
-            "executor.placing_order",
-            question=signal.estimate.market.question[:50],
-            side=signal.side,
-            size=f"${signal.position_size_usd:.2f}",
-            token=signal.token_id[:20] + "...",
-        )
+        py_clob_client issues each call through bare requests.* functions,
+        which open a fresh TLS connection per request. A keep-alive Session
+        amortizes the handshake across get_order_book/post_order calls.
+        Best-effort — skipped silently if the client internals differ.
+        """
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
 
+            if hasattr(self.client, "session"):
+                self.client.session = session
+            else:
+                # The client calls module-level requests.* in its
+                # http_helpers; the shim routes the verbs through the
+                # session without hiding the module's exception classes.
+                from py_clob_client.http_helpers import helpers as _helpers
+                _helpers.requests = _PooledRequests(session)
+            self._http_session = session
+        except Exception as e:
+            log.warning("executor.session_pool_failed", error=str(e))
+
+    def _load_cached_creds(self) -> ApiCreds | None:
+        """Load previously derived API creds from disk, if any."""
         try:
-            # ----------------------------------------------------------
-            # 1. Check order book depth and slippage
-            # ----------------------------------------------------------
-            book = self.client.get_order_book(signal.token_id)
+            path = _creds_cache_path()
+            if path.exists():
+                data = json.loads(path.read_text())
+                log.info("executor.creds_cache_hit", path=str(path))
+                return ApiCreds(**data)
+        except Exception as e:
+            log.warning("executor.creds_cache_read_failed", error=str(e))
+        return None
+
+    def _save_cached_creds(self, creds: ApiCreds):
+        """Persist derived creds (owner-only file) for future cold starts."""
+        try:
+            CREDS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            path = _creds_cache_path()
+            path.write_text(json.dumps({
+                "api_key": creds.api_key,
+                "api_secret": creds.api_secret,
+                "api_passphrase": creds.api_passphrase,
+            }))
+            os.chmod(path, 0o600)
+        except Exception as e:
+            log.warning("executor.creds_cache_write_failed", error=str(e))
+
+    def _precheck(self, signal: TradeSignal, book=None) -> tuple[float | None, str | None]:
+        """Run depth/slippage checks against the order book.
+
+        Accepts a pre-fetched book (from the batch get_order_books call);
+        falls back to a single get_order_book fetch when not supplied.
+        Returns (best_ask, error). Pure read — safe to run concurrently
+        across signals since no shared state is touched.
+        """
+        try:
+            if book is None:
+                book = self.client.get_order_book(signal.token_id)
 
             # book.asks is a list of OrderSummary objects with .price and .size
             if not book.asks:
-                return ExecutionResult(
-                    signal=signal, success=False, order_id=None,
-                    fill_price=None, fill_amount=None,
-                    error="No asks in order book — market may be illiquid",
-                )
+                return None, "No asks in order book — market may be illiquid"
 
             best_ask = float(book.asks[0].price)
 
             # Slippage guard: reject if best ask is >5% above our expected entry
             max_acceptable = min(signal.entry_price * 1.05, 0.99)
             if best_ask > max_acceptable:
-                return ExecutionResult(
-                    signal=signal, success=False, order_id=None,
-                    fill_price=None, fill_amount=None,
-                    error=f"Slippage: best_ask={best_ask:.4f} > max={max_acceptable:.4f}",
-                )
+                return None, f"Slippage: best_ask={best_ask:.4f} > max={max_acceptable:.4f}"
+
+            return best_ask, None
+        except Exception as e:
+            return None, str(e)
+
+    def execute(self, signal: TradeSignal) -> ExecutionResult:
+        """Execute a single trade signal as a Fill-or-Kill market order."""
+
+        log.info(
+            "executor.placing_order",
+            question=signal.estimate.market.question[:50],
+            side=signal.side,
+            size=f"${signal.position_size_usd:.2f}",
+            token=signal.token_id[:20] + "...",
+        )
 
+        # ----------------------------------------------------------
+        # 1. Check order book depth and slippage
+        # ----------------------------------------------------------
+        best_ask, precheck_error = self._precheck(signal)
+        if precheck_error:
+            return ExecutionResult(
+                signal=signal, success=False, order_id=None,
+                fill_price=None, fill_amount=None, error=precheck_error,
+            )
+
+        return self._submit(signal, best_ask)
+
+    def _submit(self, signal: TradeSignal, best_ask: float) -> ExecutionResult:
+        """Build, sign and post the FOK market order after a passed precheck."""
+        try:
             # ----------------------------------------------------------
             # 2. Build and submit market order (FOK)
             # ----------------------------------------------------------
@@ -159,14 +278,67 @@ class TradeExecutor:
             )
 
     def execute_batch(self, signals: list[TradeSignal]) -> list[ExecutionResult]:
-        """Execute multiple trade signals sequentially.
+        """Execute multiple trade signals.
 
-        In production you could batch these, but sequential is safer
-        for a small bankroll — you can abort if something goes wrong.
+        Order-book prechecks are independent reads, so they run in a small
+        thread pool. Order submission stays strictly sequential — safer for
+        a small bankroll, and we can abort if something goes wrong.
         """
+        if not signals:
+            return []
+
+        # Prefetch all order books in one request — N round-trips become 1.
+        books = {}
+        try:
+            params = [BookParams(token_id=s.token_id) for s in signals]
+            books = {b.asset_id: b for b in self.client.get_order_books(params)}
+        except Exception as e:
+            log.warning("executor.book_prefetch_failed", error=str(e))
+
+        if books:
+            # Books already in hand — run the slippage math vectorized.
+            # NaN marks a missing/empty book and fails the accept compare.
+            n = len(signals)
+            entries = np.fromiter(
+                (s.entry_price for s in signals), dtype=np.float64, count=n
+            )
+            asks = np.full(n, np.nan)
+            for i, s in enumerate(signals):
+                book = books.get(s.token_id)
+                if book is not None and book.asks:
+                    asks[i] = float(book.asks[0].price)
+            max_acceptable = np.minimum(entries * 1.05, 0.99)
+            accept = asks <= max_acceptable
+
+            prechecks = []
+            for i, s in enumerate(signals):
+                if accept[i]:
+                    prechecks.append((float(asks[i]), None))
+                elif books.get(s.token_id) is None:
+                    # Book missing from the batch response — fetch singly
+                    prechecks.append(self._precheck(s))
+                elif np.isnan(asks[i]):
+                    prechecks.append(
+                        (None, "No asks in order book — market may be illiquid")
+                    )
+                else:
+                    prechecks.append((
+                        None,
+                        f"Slippage: best_ask={asks[i]:.4f} > max={max_acceptable[i]:.4f}",
+                    ))
+        else:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                prechecks = list(pool.map(self._precheck, signals))
+
         results = []
-        for signal in signals:
-            result = self.execute(signal)
+        for signal, (best_ask, precheck_error) in zip(signals, prechecks):
+            if precheck_error:
+                result = ExecutionResult(
+                    signal=signal, success=False, order_id=None,
+                    fill_price=None, fill_amount=None, error=precheck_error,
+                )
+            else:
+                result = self._submit(signal, best_ask)
             results.append(result)
 
             # If a trade fails due to auth/network, stop trying
@@ -180,14 +352,19 @@ class TradeExecutor:
 
         return results
 
-    def get_midpoint(self, token_id: str) -> float | None:
-        """Get midpoint price for a token."""
+    def get_midpoints(self, token_ids: list[str]) -> dict[str, float]:
+        """Get midpoint prices for several tokens in a single request."""
         try:
-            mid = self.client.get_midpoint(token_id)
-            return float(mid) if mid else None
+            params = [BookParams(token_id=tid) for tid in token_ids]
+            resp = self.client.get_midpoints(params)
+            return {tid: float(mid) for tid, mid in resp.items() if mid}
         except Exception as e:
             log.warning("executor.midpoint_error", error=str(e))
-            return None
+            return {}
+
+    def get_midpoint(self, token_id: str) -> float | None:
+        """Get midpoint price for a token (thin wrapper over the batch call)."""
+        return self.get_midpoints([token_id]).get(token_id)
 
     def check_connectivity(self) -> bool:
         """Verify CLOB API is reachable and credentials work."""
@@ -6,18 +6,44 @@ This is the "brain" of the agent — Claude reasons about whether markets
 are mispriced based on the question, description, and external data.
 """
 
-import json
+import asyncio
+import atexit
+import hashlib
+import pickle
+import re
+import time
 import anthropic
+import orjson
 import structlog
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+from collections import OrderedDict
 from dataclasses import dataclass
+from pathlib import Path
 from scanner import ScannedMarket
 from data_enrichment import DataEnricher
 from config import config
 
 log = structlog.get_logger()
 
+# Locates the JSON object inside a response that may be wrapped in markdown
+# fences or surrounded by stray prose — cheaper than scanning/stripping the
+# whole text before parsing.
+_JSON_RE = re.compile(rb'\{[^{}]*"fair_yes_probability".*?\}', re.S)
 
-@dataclass
+# Early-field extraction while a response is still streaming — the two
+# numeric fields arrive well before the reasoning text finishes.
+_EARLY_PROB_RE = re.compile(r'"fair_yes_probability"\s*:\s*([0-9.eE+-]+)')
+_EARLY_CONF_RE = re.compile(r'"confidence"\s*:\s*([0-9.eE+-]+)')
+
+
+# slots=True: these are created by the hundreds per cycle; skipping the
+# per-instance __dict__ cuts each one from ~400 B to ~120 B
+@dataclass(slots=True)
 class FairValueEstimate:
     market: ScannedMarket
     fair_yes_prob: float  # Claude's estimated true probability of YES
@@ -30,7 +56,7 @@ class FairValueEstimate:
     output_tokens: int
 
 
-SYSTEM_PROMPT = """You are an expert prediction market analyst. Your job is to estimate the TRUE probability of event outcomes, independent of what the market currently thinks.
+_SYSTEM_TEMPLATE = """You are an expert prediction market analyst. Your job is to estimate the TRUE probability of event outcomes, independent of what the market currently thinks.
 
 You will be given:
 1. A market question and description
@@ -38,11 +64,70 @@ You will be given:
 3. External data (weather forecasts, injury reports, crypto metrics, etc.)
 
 Your response must be valid JSON with exactly these fields:
-{
+{{
     "fair_yes_probability": <float 0.0 to 1.0>,
     "confidence": <float 0.0 to 1.0>,
     "reasoning": "<brief explanation of your estimate>"
+}}
+
+Guidelines:
+- Be calibrated. If you're unsure, your probability should reflect that uncertainty.
+- Use the external data when available — it may contain information the market hasn't priced in yet.
+- Consider base rates, historical precedents, and logical reasoning.
+- A confidence of 0.5 means you're very uncertain about your estimate.
+- A confidence of 0.9+ means you have strong evidence.
+{category_guidance}
+
+Return ONLY the JSON object, no other text."""
+
+# Category-specific guidance lines — a weather market doesn't need the
+# crypto or sports rules in its prompt, and dropping them trims input
+# tokens on every single-market call.
+_CATEGORY_GUIDANCE = {
+    "politics": "- Be especially careful with politics — markets are often efficient there.",
+    "weather": "- For weather: NOAA data is gold. If NOAA says 80% chance of rain, trust it.",
+    "sports": "- For sports: injury reports can create 10-20% mispricings if the market is slow to react.",
+    "crypto": "- For crypto: on-chain metrics + sentiment can signal short-term moves.",
+}
+
+# Generic prompt carries every category's guidance — used as the fallback
+# for unknown categories and kept for compatibility.
+SYSTEM_PROMPT = _SYSTEM_TEMPLATE.format(
+    category_guidance="\n".join(_CATEGORY_GUIDANCE.values())
+)
+
+# System block marked for Anthropic prompt caching — the prompt is identical
+# on every call, so cache re-reads bill at 10% of the normal input rate.
+SYSTEM_BLOCKS = [
+    {
+        "type": "text",
+        "text": SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }
+]
+
+_PROMPT_CACHING_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+
+BUNDLE_SYSTEM_PROMPT = """You are an expert prediction market analyst. Your job is to estimate the TRUE probability of event outcomes, independent of what the market currently thinks.
+
+You will be given several markets. For EACH market you will see:
+1. The market question and description
+2. The current market price (YES probability)
+3. External data (weather forecasts, injury reports, crypto metrics, etc.)
+
+Your response must be valid JSON with exactly this shape:
+{
+    "markets": [
+        {
+            "slug": "<the market's slug, copied exactly>",
+            "fair_yes_probability": <float 0.0 to 1.0>,
+            "confidence": <float 0.0 to 1.0>,
+            "reasoning": "<brief explanation of your estimate>"
+        },
+        ...
+    ]
 }
+Include one entry per market, in any order, keyed by slug.
 
 Guidelines:
 - Be calibrated. If you're unsure, your probability should reflect that uncertainty.
@@ -57,118 +142,686 @@ Guidelines:
 
 Return ONLY the JSON object, no other text."""
 
+BUNDLE_SYSTEM_BLOCKS = [
+    {
+        "type": "text",
+        "text": BUNDLE_SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }
+]
+
+# Parsed once at import — format_map skips re-parsing the format specs on
+# every call, and the numeric fields arrive pre-formatted.
+_USER_PROMPT = """Market Question: {question}
+
+Description: {description}
+
+Resolution Source: {resolution_source}
+
+Current Market Price (YES): {yes_px} ({yes_pct}%)
+Current Market Price (NO): {no_px} ({no_pct}%)
+
+24h Volume: ${volume}
+Liquidity: ${liquidity}
+End Date: {end_date}
+Category: {category}
+
+{enrichment}
+
+What is the TRUE probability of YES?"""
+
+
+class RateLimiter:
+    """Proactive request/token pacing for Claude calls.
+
+    Maintains leaky-bucket RPM and TPM budgets that refill continuously and
+    delays dispatch until both have capacity — pacing requests up front
+    instead of burning retries on 429s. Token costs are pre-estimated from
+    prompt length and reconciled against actual usage on completion.
+    """
+
+    def __init__(self, rpm: float = 40, tpm: float = 16000):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests_available = float(rpm)
+        self.tokens_available = float(tpm)
+        self.last_update = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.requests_available = min(
+            self.rpm, self.requests_available + (elapsed / 60) * self.rpm
+        )
+        self.tokens_available = min(
+            self.tpm, self.tokens_available + (elapsed / 60) * self.tpm
+        )
+
+    async def acquire(self, estimated_tokens: int):
+        """Block until both buckets can cover one request."""
+        while True:
+            self._refill()
+            if self.requests_available >= 1 and self.tokens_available >= estimated_tokens:
+                self.requests_available -= 1
+                self.tokens_available -= estimated_tokens
+                return
+            await asyncio.sleep(0.05)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token bucket once real usage is known."""
+        self.tokens_available -= actual_tokens - estimated_tokens
+
 
 class FairValueEngine:
+    # Concurrent request cap for the immediate (non-Batches) path — keep
+    # below the account's concurrent-connection limit, tune per API tier.
+    MAX_CONCURRENCY = 8
+
+    # Estimate cache: markets that haven't moved (same 1¢ price bucket and
+    # same enrichment) reuse the prior estimate with the edge recomputed,
+    # skipping the API call entirely.
+    CACHE_TTL = 1800.0  # 30 min
+    CACHE_MAX_ENTRIES = 2000
+    CACHE_FILE = Path(".fair_value_cache.pkl")
+
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=config.anthropic_api_key)
+        self.client = anthropic.Anthropic(
+            api_key=config.anthropic_api_key,
+            default_headers=_PROMPT_CACHING_HEADERS,
+        )
+        self.aclient = anthropic.AsyncAnthropic(
+            api_key=config.anthropic_api_key,
+            default_headers=_PROMPT_CACHING_HEADERS,
+        )
         self.enricher = DataEnricher()
+        self.limiter = RateLimiter()
+        # System prompts specialized per category at startup — each keeps
+        # only its own guidance and gets its own prompt-cache entry
+        self._system_blocks = {
+            cat: [{
+                "type": "text",
+                "text": _SYSTEM_TEMPLATE.format(category_guidance=guidance),
+                "cache_control": {"type": "ephemeral"},
+            }]
+            for cat, guidance in _CATEGORY_GUIDANCE.items()
+        }
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        # Tokens processed via the Batches API — billed at 50%
+        self.batch_input_tokens = 0
+        self.batch_output_tokens = 0
+        # Prompt-cache traffic — billed at $0.30/Mtok (reads), $3.75/Mtok (writes)
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
+        # Per-cycle counters — reset by run_cycle, so the cycle's cost is a
+        # direct read instead of a lifetime-total subtraction
+        self.cycle_input_tokens = 0
+        self.cycle_output_tokens = 0
+        self.cycle_batch_input_tokens = 0
+        self.cycle_batch_output_tokens = 0
+        self.cycle_cache_read_tokens = 0
+        self.cycle_cache_creation_tokens = 0
+        self._cache: OrderedDict[str, tuple[float, FairValueEstimate]] = OrderedDict()
+        # Last estimate per slug — used to skip re-estimating markets that
+        # showed no edge and whose price has barely moved since
+        self._last: dict[str, FairValueEstimate] = {}
+        self._load_cache()
+        atexit.register(self._save_cache)
+
+    # -- Estimate cache -----------------------------------------------------
+
+    def _cache_key(self, market: ScannedMarket, enrichment: str) -> str:
+        enrichment_hash = hashlib.blake2b(
+            enrichment.encode(), digest_size=8
+        ).hexdigest()
+        payload = f"{market.slug}|{round(market.yes_price, 2)}|{enrichment_hash}"
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _cache_get(
+        self, key: str, market: ScannedMarket
+    ) -> FairValueEstimate | None:
+        """Return a fresh cache hit re-based on the current market price."""
+        hit = self._cache.get(key)
+        if hit is None:
+            return None
+        ts, cached = hit
+        if time.time() - ts > self.CACHE_TTL:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+
+        # Price may have moved inside the bucket — recompute the edge
+        edge = cached.fair_yes_prob - market.yes_price
+        return FairValueEstimate(
+            market=market,
+            fair_yes_prob=cached.fair_yes_prob,
+            confidence=cached.confidence,
+            reasoning=cached.reasoning,
+            edge=edge,
+            abs_edge=abs(edge),
+            recommended_side="YES" if edge > 0 else "NO",
+            input_tokens=0,
+            output_tokens=0,
+        )
+
+    def _cache_put(self, key: str, estimate: FairValueEstimate):
+        self._cache[key] = (time.time(), estimate)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    def _load_cache(self):
+        try:
+            if self.CACHE_FILE.exists():
+                self._cache = pickle.loads(self.CACHE_FILE.read_bytes())
+                log.info("fair_value.cache_loaded", entries=len(self._cache))
+        except Exception as e:
+            log.warning("fair_value.cache_load_failed", error=str(e))
+            self._cache = OrderedDict()
 
-    def estimate(self, market: ScannedMarket) -> FairValueEstimate | None:
-        """Ask Claude to estimate the fair probability for a market."""
-        enrichment = self.enricher.enrich(market)
-
-        user_prompt = f"""Market Question: {market.question}
-
-Description: {market.description}
-
-Resolution Source: {market.resolution_source}
-
-Current Market Price (YES): {market.yes_price:.4f} ({market.yes_price*100:.1f}%)
-Current Market Price (NO): {market.no_price:.4f} ({market.no_price*100:.1f}%)
+    def _save_cache(self):
+        try:
+            self.CACHE_FILE.write_bytes(pickle.dumps(self._cache))
+        except Exception as e:
+            log.warning("fair_value.cache_save_failed", error=str(e))
+
+    def _build_user_prompt(self, market: ScannedMarket, enrichment: str | None = None) -> str:
+        """Assemble the per-market user prompt, including enrichment data."""
+        if enrichment is None:
+            enrichment = self.enricher.enrich(market)
+
+        return _USER_PROMPT.format_map({
+            "question": market.question,
+            "description": market.description,
+            "resolution_source": market.resolution_source,
+            "yes_px": f"{market.yes_price:.4f}",
+            "yes_pct": f"{market.yes_price*100:.1f}",
+            "no_px": f"{market.no_price:.4f}",
+            "no_pct": f"{market.no_price*100:.1f}",
+            "volume": f"{market.volume_24h:,.0f}",
+            "liquidity": f"{market.liquidity:,.0f}",
+            "end_date": market.end_date,
+            "category": market.category,
+            "enrichment": enrichment,
+        })
+
+    def _track_usage(
+        self, input_tokens: int, output_tokens: int,
+        cache_read: int, cache_creation: int, batched: bool = False,
+    ):
+        """Accumulate token usage into the lifetime and cycle counters."""
+        if batched:
+            self.batch_input_tokens += input_tokens
+            self.batch_output_tokens += output_tokens
+            self.cycle_batch_input_tokens += input_tokens
+            self.cycle_batch_output_tokens += output_tokens
+        else:
+            self.total_input_tokens += input_tokens
+            self.total_output_tokens += output_tokens
+            self.cycle_input_tokens += input_tokens
+            self.cycle_output_tokens += output_tokens
+        self.cache_read_tokens += cache_read
+        self.cache_creation_tokens += cache_creation
+        self.cycle_cache_read_tokens += cache_read
+        self.cycle_cache_creation_tokens += cache_creation
+
+    def reset_cycle_tokens(self):
+        """Zero the per-cycle counters (called at the start of each cycle)."""
+        self.cycle_input_tokens = 0
+        self.cycle_output_tokens = 0
+        self.cycle_batch_input_tokens = 0
+        self.cycle_batch_output_tokens = 0
+        self.cycle_cache_read_tokens = 0
+        self.cycle_cache_creation_tokens = 0
+
+    @staticmethod
+    def _usage_tuple(usage) -> tuple[int, int, int, int]:
+        """(input, output, cache_read, cache_creation) from a usage object."""
+        return (
+            usage.input_tokens,
+            usage.output_tokens,
+            getattr(usage, "cache_read_input_tokens", 0) or 0,
+            getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        )
+
+    def _estimate_from_response(
+        self, market: ScannedMarket, response, batched: bool = False,
+        track: bool = True,
+    ) -> FairValueEstimate | None:
+        """Parse a Claude message into a FairValueEstimate and track tokens.
+
+        track=False skips the counter writes — concurrent callers sum
+        usage locally and accumulate once at batch end instead.
+        """
+        try:
+            input_tokens, output_tokens, cache_read, cache_creation = (
+                self._usage_tuple(response.usage)
+            )
+            if track:
+                self._track_usage(
+                    input_tokens, output_tokens, cache_read, cache_creation,
+                    batched=batched,
+                )
+
+            # Parse response: pull out just the JSON object and decode with
+            # orjson; fall back to fence stripping if that fails
+            raw = response.content[0].text.encode()
+            match = _JSON_RE.search(raw)
+            try:
+                data = orjson.loads(match.group(0) if match else raw)
+            except orjson.JSONDecodeError:
+                text = response.content[0].text.strip()
+                if text.startswith("```"):
+                    text = text.split("\n", 1)[1].rsplit("```", 1)[0].strip()
+                data = orjson.loads(text)
+
+            return self._make_estimate(
+                market,
+                fair_yes=float(data["fair_yes_probability"]),
+                confidence=float(data["confidence"]),
+                reasoning=data["reasoning"],
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+            )
 
-24h Volume: ${market.volume_24h:,.0f}
-Liquidity: ${market.liquidity:,.0f}
-End Date: {market.end_date}
-Category: {market.category}
+        except orjson.JSONDecodeError as e:
+            log.error("fair_value.json_parse_error", error=str(e), market=market.slug)
+            return None
+        except Exception as e:
+            log.error("fair_value.unexpected_error", error=str(e), market=market.slug)
+            return None
 
-{enrichment}
+    def _make_estimate(
+        self, market: ScannedMarket, fair_yes: float, confidence: float,
+        reasoning: str, input_tokens: int, output_tokens: int,
+    ) -> FairValueEstimate:
+        """Build a FairValueEstimate (edge + side) from parsed fields."""
+        # Calculate edge
+        edge = fair_yes - market.yes_price
+        abs_edge = abs(edge)
+
+        # Determine which side to trade
+        if edge > 0:
+            recommended_side = "YES"  # Market underprices YES
+        else:
+            recommended_side = "NO"   # Market underprices NO
+
+        estimate = FairValueEstimate(
+            market=market,
+            fair_yes_prob=fair_yes,
+            confidence=confidence,
+            reasoning=reasoning,
+            edge=edge,
+            abs_edge=abs_edge,
+            recommended_side=recommended_side,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        )
+
+        log.info(
+            "fair_value.estimate",
+            question=market.question[:60],
+            market_price=f"{market.yes_price:.2f}",
+            fair_value=f"{fair_yes:.2f}",
+            edge=f"{edge:+.2f}",
+            confidence=f"{confidence:.2f}",
+        )
+        self._last[market.slug] = estimate
+        return estimate
+
+    def estimate_bundle(
+        self, markets: list[ScannedMarket], bundle_size: int = 8
+    ) -> list[FairValueEstimate]:
+        """Estimate several markets per Claude request.
+
+        Bundling amortizes the system prompt and per-request overhead over
+        bundle_size markets and cuts RPM pressure by the same factor. Any
+        bundle whose response can't be parsed falls back to per-market
+        estimates.
+        """
+        estimates = []
+        for start in range(0, len(markets), bundle_size):
+            bundle = markets[start:start + bundle_size]
+            estimates.extend(self._estimate_bundle_one(bundle))
+        return estimates
 
-What is the TRUE probability of YES?"""
+    def _estimate_bundle_one(
+        self, bundle: list[ScannedMarket]
+    ) -> list[FairValueEstimate]:
+        by_slug = {m.slug: m for m in bundle}
+        sections = [
+            f"Market {i} (slug={m.slug}):\n{self._build_user_prompt(m)}"
+            for i, m in enumerate(bundle, 1)
+        ]
+        user_prompt = (
+            "Analyze each of the following markets and return one JSON entry "
+            "per market as described.\n\n" + "\n\n".join(sections)
+        )
 
         try:
             response = self.client.messages.create(
                 model=config.claude_model,
-                max_tokens=500,
-                system=SYSTEM_PROMPT,
+                max_tokens=200 * len(bundle),
+                system=BUNDLE_SYSTEM_BLOCKS,
                 messages=[{"role": "user", "content": user_prompt}],
             )
 
-            # Track token usage for cost accounting
-            input_tokens = response.usage.input_tokens
-            output_tokens = response.usage.output_tokens
-            self.total_input_tokens += input_tokens
-            self.total_output_tokens += output_tokens
+            input_tokens, output_tokens, cache_read, cache_creation = (
+                self._usage_tuple(response.usage)
+            )
+            self._track_usage(input_tokens, output_tokens, cache_read, cache_creation)
 
-            # Parse response
             text = response.content[0].text.strip()
-            # Handle potential markdown code fences
             if text.startswith("```"):
                 text = text.split("\n", 1)[1].rsplit("```", 1)[0].strip()
+            data = orjson.loads(text)
+
+            # Apportion the bundle's tokens evenly across its markets
+            per_in = input_tokens // len(bundle)
+            per_out = output_tokens // len(bundle)
+
+            estimates = []
+            for item in data.get("markets", []):
+                market = by_slug.pop(item.get("slug", ""), None)
+                if market is None:
+                    continue
+                estimates.append(self._make_estimate(
+                    market,
+                    fair_yes=float(item["fair_yes_probability"]),
+                    confidence=float(item["confidence"]),
+                    reasoning=item.get("reasoning", ""),
+                    input_tokens=per_in,
+                    output_tokens=per_out,
+                ))
+        except Exception as e:
+            log.warning("fair_value.bundle_failed", error=str(e), markets=len(bundle))
+            # Whole bundle unusable — fall back per market
+            return [est for m in bundle if (est := self.estimate(m))]
 
-            data = json.loads(text)
-
-            fair_yes = float(data["fair_yes_probability"])
-            confidence = float(data["confidence"])
-            reasoning = data["reasoning"]
-
-            # Calculate edge
-            edge = fair_yes - market.yes_price
-            abs_edge = abs(edge)
+        # Markets the response skipped get individual fallback calls
+        for market in by_slug.values():
+            est = self.estimate(market)
+            if est:
+                estimates.append(est)
+        return estimates
 
-            # Determine which side to trade
-            if edge > 0:
-                recommended_side = "YES"  # Market underprices YES
-            else:
-                recommended_side = "NO"   # Market underprices NO
+    def estimate(
+        self, market: ScannedMarket, enrichment: str | None = None
+    ) -> FairValueEstimate | None:
+        """Ask Claude to estimate the fair probability for a market.
 
-            estimate = FairValueEstimate(
+        Pass enrichment when it was prefetched (enrich_batch) to keep the
+        external fetch off this call's critical path.
+        """
+        # A prior estimate with near-zero edge won't cross the mispricing
+        # threshold unless the price moved — skip the call and reuse it
+        prev = self._last.get(market.slug)
+        if (
+            prev is not None
+            and prev.abs_edge < 0.03
+            and abs(market.yes_price - prev.market.yes_price) < 0.03
+        ):
+            log.info("fair_value.skipped_stale_noise", market=market.slug)
+            edge = prev.fair_yes_prob - market.yes_price
+            return FairValueEstimate(
                 market=market,
-                fair_yes_prob=fair_yes,
-                confidence=confidence,
-                reasoning=reasoning,
+                fair_yes_prob=prev.fair_yes_prob,
+                confidence=prev.confidence,
+                reasoning=prev.reasoning,
                 edge=edge,
-                abs_edge=abs_edge,
-                recommended_side=recommended_side,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
+                abs_edge=abs(edge),
+                recommended_side="YES" if edge > 0 else "NO",
+                input_tokens=0,
+                output_tokens=0,
             )
 
-            log.info(
-                "fair_value.estimate",
-                question=market.question[:60],
-                market_price=f"{market.yes_price:.2f}",
-                fair_value=f"{fair_yes:.2f}",
-                edge=f"{edge:+.2f}",
-                confidence=f"{confidence:.2f}",
-            )
-            return estimate
+        if enrichment is None:
+            enrichment = self.enricher.enrich(market)
+        key = self._cache_key(market, enrichment)
+        cached = self._cache_get(key, market)
+        if cached is not None:
+            log.info("fair_value.cache_hit", market=market.slug)
+            return cached
 
-        except json.JSONDecodeError as e:
-            log.error("fair_value.json_parse_error", error=str(e), market=market.slug)
-            return None
+        user_prompt = self._build_user_prompt(market, enrichment)
+
+        try:
+            response = self._stream_message(market, user_prompt)
         except anthropic.APIError as e:
-            log.error("fair_value.api_error", error=str(e))
-            return None
-        except Exception as e:
-            log.error("fair_value.unexpected_error", error=str(e), market=market.slug)
+            log.error(
+                "fair_value.api_error",
+                error=str(e),
+                attempts=self._stream_message.retry.statistics.get("attempt_number"),
+            )
             return None
 
-    def estimate_batch(self, markets: list[ScannedMarket]) -> list[FairValueEstimate]:
+        estimate = self._estimate_from_response(market, response)
+        if estimate:
+            self._cache_put(key, estimate)
+        return estimate
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_random_exponential(multiplier=1, max=20),
+        retry=retry_if_exception_type(
+            (anthropic.RateLimitError, anthropic.APIConnectionError)
+        ),
+        reraise=True,
+    )
+    def _stream_message(self, market: ScannedMarket, user_prompt: str):
+        """Stream one Claude response, retrying transient failures.
+
+        Streaming surfaces the numeric fields as soon as they arrive,
+        rather than blocking on the full body (reasoning is the bulk of
+        the output and lands last). 429s and connection drops get up to
+        three attempts with jittered exponential backoff.
+        """
+        with self.client.messages.stream(
+            model=config.claude_model,
+            max_tokens=500,
+            system=self._system_blocks.get(market.category, SYSTEM_BLOCKS),
+            messages=[{"role": "user", "content": user_prompt}],
+        ) as stream:
+            buf = ""
+            early_logged = False
+            for chunk in stream.text_stream:
+                buf += chunk
+                if not early_logged and (prob := _EARLY_PROB_RE.search(buf)):
+                    conf = _EARLY_CONF_RE.search(buf)
+                    if conf:
+                        early_logged = True
+                        log.info(
+                            "fair_value.early_fields",
+                            market=market.slug,
+                            fair_value=float(prob.group(1)),
+                            confidence=float(conf.group(1)),
+                        )
+            return stream.get_final_message()
+
+    def estimate_batch(
+        self, markets: list[ScannedMarket], batch_mode: bool = True,
+        enrichments: dict[str, str] | None = None,
+    ) -> list[FairValueEstimate]:
         """Estimate fair values for a batch of markets.
 
-        In production, you'd want to:
-        1. Use Claude's batch API for cost savings (50% off)
-        2. Parallelize with asyncio
-        3. Rate-limit to stay within API limits
+        With batch_mode (default), requests go through the Message Batches
+        API at 50% token cost — the 10-minute cycle has latency budget to
+        spare. Set batch_mode=False to force immediate per-call requests
+        (e.g. when a cycle must complete quickly near the death threshold).
+        enrichments maps slug -> prefetched enrichment text (enrich_batch);
+        markets missing from it are enriched inline.
+        """
+        if enrichments is None:
+            enrichments = self.enricher.enrich_batch(markets)
+
+        if batch_mode and len(markets) > 1:
+            try:
+                return self._estimate_batch_api(markets, enrichments=enrichments)
+            except Exception as e:
+                # Error, not warning: if this path is persistently broken the
+                # 50% batch discount silently never materializes
+                log.error("fair_value.batch_api_failed", error=str(e))
+
+        return asyncio.run(self._estimate_batch_async(markets, enrichments))
+
+    async def _estimate_one(
+        self, market: ScannedMarket, sem: asyncio.Semaphore,
+        enrichment: str | None = None,
+    ) -> tuple[FairValueEstimate | None, tuple[int, int, int, int] | None]:
+        """Estimate one market under the shared concurrency semaphore.
+
+        Returns (estimate, usage) — usage is None on a cache hit. Counter
+        writes happen once at batch end, not per task."""
+        async with sem:
+            if enrichment is None:
+                # Enrichment does its own (blocking) HTTP — keep it off the loop
+                enrichment = await asyncio.to_thread(self.enricher.enrich, market)
+            key = self._cache_key(market, enrichment)
+            cached = self._cache_get(key, market)
+            if cached is not None:
+                log.info("fair_value.cache_hit", market=market.slug)
+                return cached, None
+
+            user_prompt = self._build_user_prompt(market, enrichment)
+
+            # Rough token estimate: ~4 chars/token input plus max_tokens out
+            estimated_tokens = len(user_prompt) // 4 + 500
+            await self.limiter.acquire(estimated_tokens)
+
+            response = await self._create_message_async(market, user_prompt)
+            self.limiter.reconcile(
+                estimated_tokens,
+                response.usage.input_tokens + response.usage.output_tokens,
+            )
+        estimate = self._estimate_from_response(market, response, track=False)
+        if estimate:
+            self._cache_put(key, estimate)
+        return estimate, self._usage_tuple(response.usage)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_random_exponential(multiplier=1, max=20),
+        retry=retry_if_exception_type(
+            (anthropic.RateLimitError, anthropic.APIConnectionError)
+        ),
+        reraise=True,
+    )
+    async def _create_message_async(self, market: ScannedMarket, user_prompt: str):
+        """Immediate-path request with the same retry policy as the sync
+        streaming path — 429s and connection drops get up to three attempts
+        with jittered exponential backoff instead of dropping the market
+        for the cycle."""
+        return await self.aclient.messages.create(
+            model=config.claude_model,
+            max_tokens=500,
+            system=self._system_blocks.get(market.category, SYSTEM_BLOCKS),
+            messages=[{"role": "user", "content": user_prompt}],
+        )
+
+    async def _estimate_batch_async(
+        self, markets: list[ScannedMarket],
+        enrichments: dict[str, str] | None = None,
+    ) -> list[FairValueEstimate]:
+        """Run per-market estimates concurrently — the calls are pure I/O
+        wait, so wall time drops from the sum of latencies to roughly the
+        max per semaphore slot."""
+        sem = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        enrichments = enrichments or {}
+        results = await asyncio.gather(
+            *[self._estimate_one(m, sem, enrichments.get(m.slug)) for m in markets],
+            return_exceptions=True,
+        )
+
+        estimates = []
+        in_tok = out_tok = cache_read = cache_creation = 0
+        for market, result in zip(markets, results):
+            if isinstance(result, Exception):
+                log.error("fair_value.api_error", error=str(result), market=market.slug)
+                continue
+            estimate, usage = result
+            if usage is not None:
+                in_tok += usage[0]
+                out_tok += usage[1]
+                cache_read += usage[2]
+                cache_creation += usage[3]
+            if estimate:
+                estimates.append(estimate)
+
+        # Single accumulation for the whole batch — no per-task contention
+        self._track_usage(in_tok, out_tok, cache_read, cache_creation)
+        return estimates
+
+    def _estimate_batch_api(
+        self, markets: list[ScannedMarket], poll_interval: float = 10.0,
+        max_wait: float = 1800.0, enrichments: dict[str, str] | None = None,
+    ) -> list[FairValueEstimate]:
+        """Submit all markets as one Message Batch and poll until done.
 
-        For now, sequential is fine for a prototype.
+        Batched requests are billed at half the per-token rate; results are
+        matched back to markets by a synthetic custom_id — the API requires
+        custom_id to match ^[a-zA-Z0-9_-]{1,64}$, which real slugs routinely
+        violate (too long, or empty).
         """
         estimates = []
-        for market in markets:
-            est = self.estimate(market)
+        by_id = {}
+        cache_keys = {}
+        requests = []
+        enrichments = enrichments or {}
+        for m in markets:
+            enrichment = enrichments.get(m.slug)
+            if enrichment is None:
+                enrichment = self.enricher.enrich(m)
+            key = self._cache_key(m, enrichment)
+            cached = self._cache_get(key, m)
+            if cached is not None:
+                log.info("fair_value.cache_hit", market=m.slug)
+                estimates.append(cached)
+                continue
+            custom_id = f"m{len(requests)}"
+            by_id[custom_id] = m
+            cache_keys[custom_id] = key
+            requests.append({
+                "custom_id": custom_id,
+                "params": {
+                    "model": config.claude_model,
+                    "max_tokens": 500,
+                    "system": self._system_blocks.get(m.category, SYSTEM_BLOCKS),
+                    "messages": [
+                        {"role": "user", "content": self._build_user_prompt(m, enrichment)}
+                    ],
+                },
+            })
+
+        if not requests:
+            return estimates
+
+        batch = self.client.messages.batches.create(requests=requests)
+        log.info("fair_value.batch_submitted", batch_id=batch.id, count=len(requests))
+
+        deadline = time.monotonic() + max_wait
+        while batch.processing_status != "ended":
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Message batch {batch.id} did not finish in {max_wait}s")
+            time.sleep(poll_interval)
+            batch = self.client.messages.batches.retrieve(batch.id)
+
+        for result in self.client.messages.batches.results(batch.id):
+            market = by_id.get(result.custom_id)
+            if market is None:
+                continue
+            if result.result.type != "succeeded":
+                log.warning(
+                    "fair_value.batch_item_failed",
+                    market=market.slug,
+                    result_type=result.result.type,
+                )
+                continue
+            est = self._estimate_from_response(
+                market, result.result.message, batched=True
+            )
             if est:
+                self._cache_put(cache_keys[result.custom_id], est)
                 estimates.append(est)
         return estimates
 
@@ -178,9 +831,38 @@ What is the TRUE probability of YES?"""
         Claude Sonnet pricing (check https://docs.anthropic.com for current):
         - Input:  $3.00 / 1M tokens
         - Output: $15.00 / 1M tokens
+        - Prompt-cache reads:  $0.30 / 1M tokens
+        - Prompt-cache writes: $3.75 / 1M tokens
+        Tokens processed via the Message Batches API are billed at 50%.
 
         These rates may have changed — update if using a different model.
         """
-        input_cost = (self.total_input_tokens / 1_000_000) * 3.00
-        output_cost = (self.total_output_tokens / 1_000_000) * 15.00
-        return input_cost + output_cost
+        return self._cost_usd(
+            self.total_input_tokens, self.total_output_tokens,
+            self.batch_input_tokens, self.batch_output_tokens,
+            self.cache_read_tokens, self.cache_creation_tokens,
+        )
+
+    def get_cycle_cost_usd(self) -> float:
+        """Cost of tokens spent since the last reset_cycle_tokens()."""
+        return self._cost_usd(
+            self.cycle_input_tokens, self.cycle_output_tokens,
+            self.cycle_batch_input_tokens, self.cycle_batch_output_tokens,
+            self.cycle_cache_read_tokens, self.cycle_cache_creation_tokens,
+        )
+
+    @staticmethod
+    def _cost_usd(
+        input_tokens: float, output_tokens: float,
+        batch_input: float, batch_output: float,
+        cache_read: float, cache_creation: float,
+    ) -> float:
+        in_tok = input_tokens + 0.5 * batch_input
+        out_tok = output_tokens + 0.5 * batch_output
+        input_cost = (in_tok / 1_000_000) * 3.00
+        output_cost = (out_tok / 1_000_000) * 15.00
+        cache_cost = (
+            (cache_read / 1_000_000) * 0.30
+            + (cache_creation / 1_000_000) * 3.75
+        )
+        return input_cost + output_cost + cache_cost
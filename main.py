@@ -15,36 +15,54 @@ Usage:
     python main.py
 """
 
+import os
 import sys
 import time
 import signal
+import threading
+import numpy as np
+import orjson
 import structlog
 from datetime import datetime, timezone
 
 from config import config
-from scanner import MarketScanner
+from scanner import MarketScanner, to_columns
 from fair_value import FairValueEngine
+from market_cache import MarketCache
 from position_sizer import MispricingDetector, KellyPositionSizer
 from executor import TradeExecutor
 from self_funding import AgentState, SelfFundingManager, DeathCheck
 
 # ── Logging ──────────────────────────────────────────────
+def _orjson_dumps(obj, **kwargs) -> str:
+    """orjson-backed serializer for structlog's JSONRenderer (2-6x stdlib)."""
+    return orjson.dumps(obj, default=str).decode()
+
+# LOG_FORMAT=json emits orjson-rendered JSON lines (for prod/ingestion);
+# the default stays the human-friendly console renderer.
+_renderer = (
+    structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    if os.environ.get("LOG_FORMAT") == "json"
+    else structlog.dev.ConsoleRenderer()
+)
+
 structlog.configure(
     processors=[
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.add_log_level,
-        structlog.dev.ConsoleRenderer(),
+        _renderer,
     ],
 )
 log = structlog.get_logger()
 
 # ── Graceful shutdown ────────────────────────────────────
-shutdown_requested = False
+# Event instead of a polled bool: the main loop blocks in wait() between
+# cycles and wakes immediately on signal, rather than ticking every second.
+shutdown_event = threading.Event()
 
 def handle_signal(signum, frame):
-    global shutdown_requested
     log.info("shutdown.requested", signal=signum)
-    shutdown_requested = True
+    shutdown_event.set()
 
 signal.signal(signal.SIGINT, handle_signal)
 signal.signal(signal.SIGTERM, handle_signal)
@@ -58,11 +76,12 @@ def run_cycle(
     executor: TradeExecutor,
     funding: SelfFundingManager,
     death_check: DeathCheck,
+    market_cache: MarketCache,
 ) -> bool:
     """Run one complete scan→analyze→trade cycle. Returns False if agent dies."""
 
     cycle_start = time.time()
-    api_cost_before = fair_value_engine.get_api_cost_usd()
+    fair_value_engine.reset_cycle_tokens()
 
     # ── Step 0: Death check ──────────────────────────────
     if death_check.is_dead():
@@ -86,8 +105,35 @@ def run_cycle(
     log.info("cycle.candidates_for_analysis", count=len(candidates))
 
     # ── Step 3: Get fair value estimates from Claude ─────
+    # Serve markets whose estimate is still fresh (and whose price barely
+    # moved) straight from the on-disk cache; only the rest go to Claude.
     log.info("cycle.step3_fair_value")
-    estimates = fair_value_engine.estimate_batch(candidates)
+    estimates = []
+    to_analyze = []
+    for m in candidates:
+        cached = market_cache.lookup(m)
+        if cached is not None:
+            estimates.append(cached)
+        else:
+            to_analyze.append(m)
+    log.info(
+        "cycle.cache_split",
+        cached=len(estimates),
+        to_analyze=len(to_analyze),
+    )
+
+    # Pipeline: start the next cycle's scan in the background while this
+    # cycle waits on Claude — step 1 of the next cycle consumes it instantly
+    scanner.prefetch()
+
+    if to_analyze:
+        # Prefetch all external data up front so enrichment never sits on
+        # the per-estimate critical path
+        enrichments = fair_value_engine.enricher.enrich_batch(to_analyze)
+        fresh = fair_value_engine.estimate_batch(to_analyze, enrichments=enrichments)
+        for est in fresh:
+            market_cache.store(est)
+        estimates.extend(fresh)
     log.info("cycle.estimates_received", count=len(estimates))
 
     # ── Step 4: Find mispricings ─────────────────────────
@@ -125,8 +171,7 @@ def run_cycle(
         log.info("cycle.no_trades", msg="No actionable signals this cycle")
 
     # ── Step 7: Account for API costs ────────────────────
-    api_cost_after = fair_value_engine.get_api_cost_usd()
-    cycle_api_cost = api_cost_after - api_cost_before
+    cycle_api_cost = fair_value_engine.get_cycle_cost_usd()
     funding.record_cycle_cost(cycle_api_cost)
 
     # ── Cycle summary ────────────────────────────────────
@@ -160,32 +205,33 @@ def _prefilter_markets(markets, max_candidates=80):
     - Include recent markets (new = less efficient)
     - Diversify across categories
     """
-    scored = []
-    for m in markets:
-        score = 0
-        # High volume = liquid, reliable
-        score += min(m.volume_24h / 10000, 5)
-        # Extreme prices are more likely mispriced
-        if m.yes_price < 0.15 or m.yes_price > 0.85:
-            score += 3
-        if m.yes_price < 0.05 or m.yes_price > 0.95:
-            score += 5
-        # Skip very extreme prices (likely already resolved or dust)
-        if m.yes_price < 0.02 or m.yes_price > 0.98:
-            continue
-        # Weather markets: we have NOAA edge
-        if m.category == "weather":
-            score += 4
-        # Sports: injury report edge
-        if m.category == "sports":
-            score += 3
-        # Crypto: on-chain edge
-        if m.category == "crypto":
-            score += 2
-        scored.append((score, m))
-
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return [m for _, m in scored[:max_candidates]]
+    if not markets:
+        return []
+
+    n = len(markets)
+    cols = to_columns(markets)
+    prices = cols["yes_price"]
+    volumes = cols["volume_24h"]
+    categories = cols["category"]
+
+    # High volume = liquid, reliable
+    score = np.minimum(volumes / 10000, 5)
+    # Extreme prices are more likely mispriced
+    score += 3 * ((prices < 0.15) | (prices > 0.85))
+    score += 5 * ((prices < 0.05) | (prices > 0.95))
+    # Weather markets: NOAA edge. Sports: injury reports. Crypto: on-chain.
+    score += 4 * (categories == "weather")
+    score += 3 * (categories == "sports")
+    score += 2 * (categories == "crypto")
+    # Skip very extreme prices (likely already resolved or dust)
+    score[(prices < 0.02) | (prices > 0.98)] = -np.inf
+
+    # Top-K via argpartition (O(n)) instead of a full sort, best-first
+    k = min(max_candidates, n)
+    idx = np.argpartition(-score, k - 1)[:k]
+    idx = idx[np.isfinite(score[idx])]
+    idx = idx[np.argsort(-score[idx])]
+    return [markets[i] for i in idx]
 
 
 def main():
@@ -245,6 +291,7 @@ def main():
     fair_value_engine = FairValueEngine()
     mispricing_detector = MispricingDetector()
     position_sizer = KellyPositionSizer(bankroll=state.current_bankroll)
+    market_cache = MarketCache()
 
     # 3. Check CLOB API connectivity
     try:
@@ -264,7 +311,7 @@ def main():
     print(f"\n🚀 Agent starting with ${state.current_bankroll:.2f} bankroll\n")
 
     # ── Main loop ────────────────────────────────────────
-    while not shutdown_requested:
+    while not shutdown_event.is_set():
         try:
             # Check if we can afford to run
             if not funding.can_afford_cycle():
@@ -278,6 +325,7 @@ def main():
                 executor=executor,
                 funding=funding,
                 death_check=death_check,
+                market_cache=market_cache,
             )
 
             if not alive:
@@ -288,22 +336,20 @@ def main():
                 print(f"   Total cycles: {health['cycles']}")
                 sys.exit(0)
 
-            # Wait for next cycle
+            # Wait for next cycle (returns early if shutdown is signalled)
             log.info("agent.sleeping", seconds=config.scan_interval)
-            for _ in range(config.scan_interval):
-                if shutdown_requested:
-                    break
-                time.sleep(1)
+            shutdown_event.wait(config.scan_interval)
 
         except KeyboardInterrupt:
             break
         except Exception as e:
             log.error("agent.cycle_error", error=str(e))
             # Don't die on transient errors, just wait and retry
-            time.sleep(60)
+            shutdown_event.wait(60)
 
     # ── Graceful shutdown ────────────────────────────────
     log.info("agent.shutdown")
+    scanner.close()
     state.save()
     print("\n🛑 Agent shut down gracefully.")
     print(funding.summary())
@@ -0,0 +1,93 @@
+"""
+Market Cache: SQLite-backed store of per-market analysis state.
+
+Most markets re-appear every 10-minute cycle with the question, description
+and price essentially unchanged — paying Claude again for them is wasted
+spend. This cache keeps the last estimate per slug on disk (so it survives
+restarts, unlike the engine's in-process cache) and serves it back as long
+as it is fresh and the price hasn't moved meaningfully.
+"""
+
+import sqlite3
+import time
+import structlog
+from fair_value import FairValueEstimate
+from scanner import ScannedMarket
+
+log = structlog.get_logger()
+
+
+class MarketCache:
+    """Persistent per-slug estimate cache with a price-move tolerance."""
+
+    MAX_AGE = 3600.0   # estimates older than 1h are re-analyzed
+    MAX_MOVE = 0.02    # re-analyze if price moved more than 2c since estimate
+
+    def __init__(self, path: str = ".market_cache.db"):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS markets (
+                slug TEXT PRIMARY KEY,
+                score REAL,
+                fair_yes REAL,
+                confidence REAL,
+                reasoning TEXT,
+                last_price REAL,
+                ts REAL
+            )"""
+        )
+        self._conn.commit()
+
+    def lookup(self, market: ScannedMarket) -> FairValueEstimate | None:
+        """Return a cached estimate re-based on the current price, or None.
+
+        A hit requires the stored estimate to be younger than MAX_AGE and
+        the price to have moved less than MAX_MOVE since it was made.
+        """
+        row = self._conn.execute(
+            "SELECT fair_yes, confidence, reasoning, last_price, ts "
+            "FROM markets WHERE slug = ?",
+            (market.slug,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        fair_yes, confidence, reasoning, last_price, ts = row
+        if fair_yes is None:
+            return None
+        if time.time() - ts > self.MAX_AGE:
+            return None
+        if abs(market.yes_price - last_price) >= self.MAX_MOVE:
+            return None
+
+        # Price may have drifted within tolerance — recompute the edge
+        edge = fair_yes - market.yes_price
+        log.info("market_cache.hit", market=market.slug)
+        return FairValueEstimate(
+            market=market,
+            fair_yes_prob=fair_yes,
+            confidence=confidence,
+            reasoning=reasoning,
+            edge=edge,
+            abs_edge=abs(edge),
+            recommended_side="YES" if edge > 0 else "NO",
+            input_tokens=0,
+            output_tokens=0,
+        )
+
+    def store(self, estimate: FairValueEstimate):
+        """Record a fresh Claude estimate for future cycles."""
+        m = estimate.market
+        self._conn.execute(
+            "INSERT INTO markets (slug, fair_yes, confidence, reasoning, last_price, ts) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(slug) DO UPDATE SET fair_yes=excluded.fair_yes, "
+            "confidence=excluded.confidence, reasoning=excluded.reasoning, "
+            "last_price=excluded.last_price, ts=excluded.ts",
+            (m.slug, estimate.fair_yes_prob, estimate.confidence,
+             estimate.reasoning, m.yes_price, time.time()),
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
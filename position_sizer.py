@@ -6,15 +6,17 @@ then calculates optimal position size using Kelly Criterion capped at 6% bankrol
 """
 
 import math
+import numpy as np
 import structlog
 from dataclasses import dataclass
 from fair_value import FairValueEstimate
 from config import config
+from _sizing_core import size_kernel
 
 log = structlog.get_logger()
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeSignal:
     """A concrete trade the agent wants to execute."""
     estimate: FairValueEstimate
@@ -41,11 +43,13 @@ class MispricingDetector:
         for est in estimates:
             if est.abs_edge >= self.min_edge and est.confidence >= 0.4:
                 signals.append(est)
+                # Raw values, not f-strings — structlog formats lazily, so a
+                # dropped record costs nothing. Hundreds of these per cycle.
                 log.info(
                     "mispricing.found",
                     question=est.market.question[:50],
-                    edge=f"{est.abs_edge*100:.1f}%",
-                    confidence=f"{est.confidence:.2f}",
+                    edge=round(est.abs_edge, 4),
+                    confidence=est.confidence,
                     side=est.recommended_side,
                 )
         # Sort by edge * confidence (best opportunities first)
@@ -81,6 +85,10 @@ class KellyPositionSizer:
         self.bankroll = bankroll
         self.max_position_pct = (max_position_pct or config.max_position_pct) / 100.0
         self.kelly_fraction = kelly_fraction
+        # Warm-compile the Numba kernel now so the first real cycle doesn't
+        # pay JIT latency (no-op when Numba isn't installed)
+        dummy = np.array([0.5])
+        size_kernel(dummy, dummy, dummy, 0.0, 0.25, 0.06, 0.0)
 
     def size(self, estimate: FairValueEstimate) -> TradeSignal | None:
         """Calculate position size for a given mispricing."""
@@ -143,13 +151,13 @@ class KellyPositionSizer:
             "position.sized",
             question=estimate.market.question[:50],
             side=signal.side,
-            entry=f"{entry_price:.3f}",
-            fair=f"{fair_price:.3f}",
-            edge=f"{edge*100:.1f}%",
-            kelly_raw=f"{kelly_raw:.3f}",
-            kelly_capped=f"{capped:.3f}",
-            size_usd=f"${position_usd:.2f}",
-            ev=f"${expected_value:.2f}",
+            entry=round(entry_price, 3),
+            fair=round(fair_price, 3),
+            edge=round(edge, 4),
+            kelly_raw=round(kelly_raw, 3),
+            kelly_capped=round(capped, 3),
+            size_usd=signal.position_size_usd,
+            ev=signal.expected_value,
         )
 
         return signal
@@ -159,30 +167,78 @@ class KellyPositionSizer:
 
         Also enforces total portfolio exposure limit:
         sum of all positions <= 50% of bankroll (diversification).
+
+        The Kelly math runs in the _sizing_core.size_kernel over contiguous
+        arrays (JIT-compiled when Numba is installed — same formulas as
+        size()); TradeSignal objects are only built for entries that pass
+        every filter.
         """
-        signals = []
-        total_exposure = 0.0
-        max_total_exposure = self.bankroll * 0.5  # never risk >50% of bankroll at once
+        if not estimates:
+            return []
+
+        n = len(estimates)
+        entry = np.empty(n)
+        fair = np.empty(n)
+        conf = np.fromiter((e.confidence for e in estimates), dtype=np.float64, count=n)
+        for i, est in enumerate(estimates):
+            if est.recommended_side == "YES":
+                entry[i] = est.market.yes_price
+                fair[i] = est.fair_yes_prob
+            else:
+                entry[i] = est.market.no_price
+                fair[i] = 1.0 - est.fair_yes_prob
 
-        for est in estimates:
-            if total_exposure >= max_total_exposure:
-                log.info("position.max_exposure_reached", total=f"${total_exposure:.2f}")
-                break
+        max_total_exposure = self.bankroll * 0.5  # never risk >50% of bankroll at once
+        idx, pos_usd, edges, kelly_raw, capped = size_kernel(
+            entry, fair, conf, self.bankroll,
+            self.kelly_fraction, self.max_position_pct, max_total_exposure,
+        )
 
-            signal = self.size(est)
-            if signal:
-                # Reduce size if it would exceed total exposure limit
-                remaining = max_total_exposure - total_exposure
-                if signal.position_size_usd > remaining:
-                    signal.position_size_usd = round(remaining, 2)
-                    signal.expected_value = round(signal.edge * signal.position_size_usd, 2)
+        signals = []
+        total_exposure = 0.0
 
-                signals.append(signal)
-                total_exposure += signal.position_size_usd
+        for j, i in enumerate(idx):
+            est = estimates[i]
+            position_usd = pos_usd[j]
+            edge = edges[j]
+            expected_value = edge * position_usd
+
+            signal = TradeSignal(
+                estimate=est,
+                side=est.recommended_side,
+                token_id=(
+                    est.market.outcome_yes_token
+                    if est.recommended_side == "YES"
+                    else est.market.outcome_no_token
+                ),
+                entry_price=float(entry[i]),
+                fair_price=float(fair[i]),
+                edge=float(edge),
+                kelly_fraction=float(kelly_raw[j]),
+                capped_fraction=float(capped[j]),
+                position_size_usd=round(float(position_usd), 2),
+                expected_value=round(float(expected_value), 2),
+            )
+
+            log.info(
+                "position.sized",
+                question=est.market.question[:50],
+                side=signal.side,
+                entry=round(signal.entry_price, 3),
+                fair=round(signal.fair_price, 3),
+                edge=round(signal.edge, 4),
+                kelly_raw=round(signal.kelly_fraction, 3),
+                kelly_capped=round(signal.capped_fraction, 3),
+                size_usd=signal.position_size_usd,
+                ev=signal.expected_value,
+            )
+
+            signals.append(signal)
+            total_exposure += signal.position_size_usd
 
         return signals
 
     def update_bankroll(self, new_bankroll: float):
         """Update bankroll after trades resolve."""
         self.bankroll = new_bankroll
-        log.info("bankroll.updated", bankroll=f"${new_bankroll:.2f}")
+        log.info("bankroll.updated", bankroll=round(new_bankroll, 2))
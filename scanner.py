@@ -3,20 +3,83 @@ Scanner: Fetches 500-1000 active markets from Polymarket's Gamma API.
 Filters for tradeable markets with sufficient liquidity.
 
 IMPORTANT: The Gamma API returns `outcomePrices` and `clobTokenIds` as
-JSON-encoded strings, e.g. '["0.65", "0.35"]'. They must be json.loads()'d.
+JSON-encoded strings, e.g. '["0.65", "0.35"]'. They must be JSON-decoded.
 """
 
-import json
-import time
+import asyncio
+import functools
 import httpx
+import numpy as np
+import orjson
 import structlog
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from config import config
 
 log = structlog.get_logger()
 
+# Category keywords, in priority order — a market matching several
+# categories keeps the first one, matching the original cascade.
+_CATEGORY_KEYWORDS = {
+    "weather": ("weather", "temperature", "rain", "hurricane", "noaa", "forecast"),
+    "sports": ("nfl", "nba", "mlb", "nhl", "soccer", "sport", "game", "match", "ufc", "boxing"),
+    "crypto": ("bitcoin", "ethereum", "crypto", "btc", "eth", "token", "defi", "solana"),
+    "politics": ("election", "president", "congress", "senate", "vote", "poll", "governor"),
+}
 
-@dataclass
+
+def _contains_any(words: tuple, question: str, tags: tuple[str, ...]) -> bool:
+    """Substring search against the question and each tag in place —
+    no concatenated copy of the text per market."""
+    return any(w in question for w in words) or any(
+        w in tag for tag in tags for w in words
+    )
+
+
+# With pyahocorasick installed, category inference is one linear pass over
+# the text instead of ~30 substring scans per market. Optional — the plain
+# cascade below is used when the package is missing.
+try:
+    import ahocorasick
+
+    _CATEGORY_AUTOMATON = ahocorasick.Automaton()
+    for _cat, _words in _CATEGORY_KEYWORDS.items():
+        for _w in _words:
+            _CATEGORY_AUTOMATON.add_word(_w, _cat)
+    _CATEGORY_AUTOMATON.make_automaton()
+except ImportError:
+    _CATEGORY_AUTOMATON = None
+
+
+def _maybe_loads(v):
+    """Decode a JSON-encoded string field, or pass a native value through."""
+    return orjson.loads(v) if isinstance(v, (str, bytes)) else v
+
+
+@functools.lru_cache(maxsize=2048)
+def _categorize(question: str, tags: tuple[str, ...]) -> str:
+    """Infer market category from lowercased question text and tags.
+
+    Memoized — the same markets reappear every scan cycle and their
+    category never changes, so repeat scans pay one dict probe instead
+    of re-running the keyword matching.
+    """
+    if _CATEGORY_AUTOMATON is not None:
+        hits = {cat for _, cat in _CATEGORY_AUTOMATON.iter(question)}
+        for tag in tags:
+            hits.update(cat for _, cat in _CATEGORY_AUTOMATON.iter(tag))
+        for cat in _CATEGORY_KEYWORDS:
+            if cat in hits:
+                return cat
+        return "other"
+
+    for cat, words in _CATEGORY_KEYWORDS.items():
+        if _contains_any(words, question, tags):
+            return cat
+    return "other"
+
+
+@dataclass(slots=True)
 class ScannedMarket:
     """Lightweight market representation for the pipeline."""
     condition_id: str
@@ -24,8 +87,11 @@ class ScannedMarket:
     slug: str
     outcome_yes_token: str
     outcome_no_token: str
-    yes_price: float
-    no_price: float
+    # Prices stored as integer thousandths (650 == $0.65): ints hash and
+    # compare cheaper than floats and dodge accumulation error; the
+    # properties below keep the float view for downstream consumers
+    yes_price_milli: int
+    no_price_milli: int
     volume_24h: float
     liquidity: float
     end_date: str
@@ -34,55 +100,176 @@ class ScannedMarket:
     resolution_source: str
     neg_risk: bool  # whether market supports negative risk (multi-outcome events)
 
+    @property
+    def yes_price(self) -> float:
+        return self.yes_price_milli / 1000.0
+
+    @property
+    def no_price(self) -> float:
+        return self.no_price_milli / 1000.0
+
+
+def to_columns(markets: list[ScannedMarket]) -> dict:
+    """Columnar (SoA) view of a scan result.
+
+    Numeric fields land in contiguous NumPy arrays so downstream filters
+    and scoring run as single vectorized ops instead of attribute lookups
+    on ~1000 Python objects; string fields stay as plain lists/arrays.
+    Row i of every column corresponds to markets[i].
+    """
+    n = len(markets)
+    return {
+        "yes_price": np.fromiter((m.yes_price_milli for m in markets), dtype=np.float64, count=n) / 1000.0,
+        "no_price": np.fromiter((m.no_price_milli for m in markets), dtype=np.float64, count=n) / 1000.0,
+        "volume_24h": np.fromiter((m.volume_24h for m in markets), dtype=np.float64, count=n),
+        "liquidity": np.fromiter((m.liquidity for m in markets), dtype=np.float64, count=n),
+        "neg_risk": np.fromiter((m.neg_risk for m in markets), dtype=np.bool_, count=n),
+        "category": np.array([m.category for m in markets]),
+        "slug": [m.slug for m in markets],
+        "condition_id": [m.condition_id for m in markets],
+    }
+
 
 class MarketScanner:
+    # Concurrent page fetches per wave — gentle on Gamma, still collapses
+    # the scan from sum-of-RTTs to roughly max-of-RTTs per wave
+    CONCURRENCY = 4
+
     def __init__(self):
         self.gamma_url = config.gamma_url
-        self.client = httpx.Client(timeout=30)
+        # Static request parts built once — per page only the offset changes
+        self._markets_url = f"{self.gamma_url}/markets"
+        self._base_params = {
+            "limit": 100,
+            "active": "true",
+            "closed": "false",
+            "order": "volume24hr",
+            "ascending": "false",
+        }
+        # Keep-alive + HTTP/2: one TLS handshake amortized across every
+        # paginated request of a scan. httpx advertises gzip (and brotli,
+        # when a decoder is installed) on its own — overriding the header
+        # would promise encodings we can't decode.
+        self._client_kwargs = dict(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+        )
+        # Single worker for the pipelined prefetch — one scan inflight max
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scan")
+        self._prefetch = None
 
     def scan(self) -> list[ScannedMarket]:
-        """Fetch all active, liquid markets from Gamma API."""
+        """Fetch all active, liquid markets from Gamma API.
+
+        If a prefetch() is inflight or finished, its result is consumed
+        instead of paying the paginated fetch again.
+        """
+        if self._prefetch is not None:
+            future, self._prefetch = self._prefetch, None
+            return future.result()
+        return self._scan_now()
+
+    def prefetch(self):
+        """Start the next scan on a background thread.
+
+        Called while a cycle is waiting on Claude, so the next cycle's
+        scan() returns an already-fetched result — the scan latency
+        overlaps with estimate time instead of adding to it.
+        """
+        if self._prefetch is None:
+            self._prefetch = self._pool.submit(self._scan_now)
+
+    def close(self):
+        """Shut down the prefetch worker (called on shutdown)."""
+        self._pool.shutdown(wait=False)
+
+    def _scan_now(self) -> list[ScannedMarket]:
+        return asyncio.run(self._scan_async())
+
+    async def _scan_async(self) -> list[ScannedMarket]:
+        """Fetch pages in concurrent waves of CONCURRENCY requests.
+
+        The scan is latency-bound on network RTT, not Gamma throughput —
+        overlapping the page fetches cuts wall time by roughly the wave
+        width. Stops at the first empty page or at max_markets.
+        """
         markets = []
+        total = 0
         offset = 0
         limit = 100  # Gamma API max page size
+        sem = asyncio.Semaphore(self.CONCURRENCY)
 
-        while len(markets) < config.max_markets:
-            try:
-                resp = self.client.get(
-                    f"{self.gamma_url}/markets",
-                    params={
-                        "limit": limit,
-                        "offset": offset,
-                        "active": "true",
-                        "closed": "false",
-                        "order": "volume24hr",
-                        "ascending": "false",
-                    },
+        def launch_wave(client, base: int) -> list:
+            return [
+                asyncio.ensure_future(
+                    self._fetch_page(client, sem, base + i * limit, limit)
                 )
-                resp.raise_for_status()
-                batch = resp.json()
+                for i in range(self.CONCURRENCY)
+            ]
 
-                if not batch:
-                    break
+        async with httpx.AsyncClient(**self._client_kwargs) as client:
+            tasks = launch_wave(client, offset)
+            while total < config.max_markets:
+                offsets = [offset + i * limit for i in range(self.CONCURRENCY)]
+                pages = await asyncio.gather(*tasks, return_exceptions=True)
 
-                for m in batch:
-                    parsed = self._parse_market(m)
-                    if parsed and parsed.liquidity >= config.min_liquidity:
-                        markets.append(parsed)
+                # Launch the next wave before parsing this one, and yield
+                # once so the requests hit the wire — parse CPU then runs
+                # while the server and the network do their part
+                tasks = launch_wave(client, offset + self.CONCURRENCY * limit)
+                await asyncio.sleep(0)
 
-                offset += limit
-                log.info("scanner.batch", fetched=len(batch), total=len(markets))
+                done = False
+                for o, page in zip(offsets, pages):
+                    if isinstance(page, Exception):
+                        log.error("scanner.http_error", error=str(page), offset=o)
+                        done = True
+                        break
+                    if not page:
+                        done = True
+                        break
+                    # One bulk extend per page instead of N appends, with a
+                    # running counter so the loop never re-measures the list
+                    parsed_batch = [
+                        p for p in map(self._parse_market, page) if p is not None
+                    ]
+                    markets.extend(parsed_batch)
+                    total += len(parsed_batch)
+                    log.info("scanner.batch", fetched=len(page), total=total)
 
-                # Respect rate limits — small delay between pages
-                time.sleep(0.25)
+                if done:
+                    break
+                offset += self.CONCURRENCY * limit
 
-            except httpx.HTTPError as e:
-                log.error("scanner.http_error", error=str(e), offset=offset)
-                break
+            # Drop the speculative wave that was inflight when the scan ended
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-        log.info("scanner.complete", total_markets=len(markets))
+        log.info("scanner.complete", total_markets=total)
         return markets
 
+    async def _fetch_page(self, client, sem, offset: int, limit: int) -> list:
+        """Fetch one page under the semaphore, backing off on 429s."""
+        async with sem:
+            for attempt in range(3):
+                resp = await client.get(
+                    self._markets_url,
+                    params={**self._base_params, "offset": offset},
+                )
+                if resp.status_code == 429:
+                    # Adaptive backoff replaces the old fixed inter-page sleep
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+                    continue
+                resp.raise_for_status()
+                return resp.json()
+            # Still rate-limited after three attempts — raise rather than
+            # return [], which would read as end-of-data and silently
+            # truncate the scan for every downstream step
+            log.warning("scanner.rate_limited", offset=offset)
+            resp.raise_for_status()
+
     def _parse_market(self, raw: dict) -> ScannedMarket | None:
         """Parse raw Gamma API response into ScannedMarket.
 
@@ -90,48 +277,50 @@ class MarketScanner:
         from the API, e.g. '["0.65", "0.35"]', NOT as native arrays.
         """
         try:
-            # --- Parse clobTokenIds (JSON-encoded string) ---
-            raw_tokens = raw.get("clobTokenIds", "[]")
-            if isinstance(raw_tokens, str):
-                tokens = json.loads(raw_tokens)
-            else:
-                tokens = raw_tokens
+            # clobTokenIds and outcomePrices arrive as JSON-encoded strings;
+            # tokens are checked first so a token-less market never pays the
+            # price decode
+            tokens = _maybe_loads(raw.get("clobTokenIds", "[]"))
             if not tokens or len(tokens) < 2:
                 return None
 
-            # --- Parse outcomePrices (JSON-encoded string) ---
-            raw_prices = raw.get("outcomePrices", '["0.5", "0.5"]')
-            if isinstance(raw_prices, str):
-                prices = json.loads(raw_prices)
-            else:
-                prices = raw_prices
+            prices = _maybe_loads(raw.get("outcomePrices", '["0.5", "0.5"]'))
             if not prices or len(prices) < 2:
                 return None
 
-            yes_price = float(prices[0])
-            no_price = float(prices[1])
+            yes_price_milli = round(float(prices[0]) * 1000)
+            no_price_milli = round(float(prices[1]) * 1000)
 
             # Skip markets with invalid prices
-            if yes_price <= 0 or no_price <= 0:
+            if yes_price_milli <= 0 or no_price_milli <= 0:
                 return None
-            if yes_price >= 1.0 and no_price >= 1.0:
+            if yes_price_milli >= 1000 and no_price_milli >= 1000:
                 return None
 
-            question = raw.get("question", "")
-            category = self._infer_category(raw)
-
             # Volume and liquidity can be strings or numbers depending on the field
             volume_24h = float(raw.get("volume24hr", 0) or 0)
             liquidity = float(raw.get("liquidityNum", 0) or raw.get("liquidity", 0) or 0)
 
+            # Gate on liquidity before the expensive part — category
+            # inference, description copy and dataclass construction are
+            # wasted work for markets the caller would drop anyway
+            if liquidity < config.min_liquidity:
+                return None
+
+            question = raw.get("question", "")
+            category = _categorize(
+                question.lower(),
+                tuple(t.get("label", "").lower() for t in raw.get("tags", [])),
+            )
+
             return ScannedMarket(
                 condition_id=raw.get("conditionId", ""),
                 question=question,
                 slug=raw.get("slug", ""),
                 outcome_yes_token=tokens[0],
                 outcome_no_token=tokens[1],
-                yes_price=yes_price,
-                no_price=no_price,
+                yes_price_milli=yes_price_milli,
+                no_price_milli=no_price_milli,
                 volume_24h=volume_24h,
                 liquidity=liquidity,
                 end_date=raw.get("endDate", ""),
@@ -140,22 +329,6 @@ class MarketScanner:
                 resolution_source=raw.get("resolutionSource", ""),
                 neg_risk=bool(raw.get("negRisk", False)),
             )
-        except (ValueError, IndexError, KeyError, json.JSONDecodeError) as e:
+        except (ValueError, IndexError, KeyError, orjson.JSONDecodeError) as e:
             log.warning("scanner.parse_error", error=str(e), slug=raw.get("slug"))
             return None
-
-    def _infer_category(self, raw: dict) -> str:
-        """Infer market category from tags and question text."""
-        question = raw.get("question", "").lower()
-        tags = [t.get("label", "").lower() for t in raw.get("tags", [])]
-        all_text = question + " " + " ".join(tags)
-
-        if any(w in all_text for w in ["weather", "temperature", "rain", "hurricane", "noaa", "forecast"]):
-            return "weather"
-        if any(w in all_text for w in ["nfl", "nba", "mlb", "nhl", "soccer", "sport", "game", "match", "ufc", "boxing"]):
-            return "sports"
-        if any(w in all_text for w in ["bitcoin", "ethereum", "crypto", "btc", "eth", "token", "defi", "solana"]):
-            return "crypto"
-        if any(w in all_text for w in ["election", "president", "congress", "senate", "vote", "poll", "governor"]):
-            return "politics"
-        return "other"
@@ -7,9 +7,12 @@ whether the agent can afford to keep running.
 If balance hits $0 → the agent dies.
 """
 
-import json
+import atexit
+import os
 import time
+import orjson
 import structlog
+from collections import deque
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -18,6 +21,21 @@ from config import config
 log = structlog.get_logger()
 
 STATE_FILE = Path("agent_state.json")
+# Append-only trade log — one JSON line per trade, so recording a trade
+# writes O(1) bytes instead of re-serializing the whole history
+TRADES_FILE = Path("trades.jsonl")
+
+
+def _state_default(obj):
+    """orjson fallback for AgentState fields.
+
+    The trade_history deque is persisted in trades.jsonl, not here — it
+    serializes as an empty list so saves stay O(1) regardless of history
+    size. Anything else unexpected falls back to str().
+    """
+    if isinstance(obj, deque):
+        return []
+    return str(obj)
 
 
 @dataclass
@@ -36,22 +54,47 @@ class AgentState:
     last_cycle_at: str = ""
     cycles_completed: int = 0
     is_alive: bool = True
-    trade_history: list = field(default_factory=list)
+    # Bounded deque: appends stay O(1) and the cap enforces itself, vs. the
+    # O(n) copy a list slice costs on every trade past the limit
+    trade_history: deque = field(default_factory=lambda: deque(maxlen=1000))
 
     def save(self):
-        """Persist state to disk."""
-        STATE_FILE.write_text(json.dumps(self.__dict__, indent=2, default=str))
+        """Persist summary state atomically.
+
+        Trade history is not serialized here — it lives in trades.jsonl.
+        The write goes to a tmp file then os.replace, so a crash mid-write
+        can never leave a torn agent_state.json.
+        """
+        tmp = STATE_FILE.with_suffix(".json.tmp")
+        tmp.write_bytes(
+            orjson.dumps(
+                self,
+                option=orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_INDENT_2,
+                default=_state_default,
+            )
+        )
+        os.replace(tmp, STATE_FILE)
 
     @classmethod
     def load(cls) -> "AgentState":
         """Load state from disk, or create new."""
         if STATE_FILE.exists():
             try:
-                data = json.loads(STATE_FILE.read_text())
+                data = orjson.loads(STATE_FILE.read_bytes())
                 state = cls()
                 for k, v in data.items():
                     if hasattr(state, k):
+                        if k == "trade_history":
+                            # Legacy state files carried the history inline;
+                            # move it into trades.jsonl before the next
+                            # save() rewrites this file without it
+                            if v and not TRADES_FILE.exists():
+                                cls._migrate_trade_history(v)
+                            v = deque(v, maxlen=1000)
                         setattr(state, k, v)
+                history = cls._load_trade_history()
+                if history:
+                    state.trade_history = history
                 return state
             except Exception as e:
                 log.warning("state.load_error", error=str(e))
@@ -59,12 +102,59 @@ class AgentState:
         state.started_at = datetime.now(timezone.utc).isoformat()
         return state
 
+    @staticmethod
+    def _migrate_trade_history(entries: list):
+        """One-time move of a legacy inline history into the append-only log."""
+        try:
+            with TRADES_FILE.open("ab") as f:
+                for entry in entries:
+                    f.write(orjson.dumps(entry) + b"\n")
+            log.info("state.trade_history_migrated", entries=len(entries))
+        except Exception as e:
+            log.warning("state.trade_history_migrate_failed", error=str(e))
+
+    @staticmethod
+    def _load_trade_history() -> deque:
+        """Rebuild the in-memory history from the tail of trades.jsonl."""
+        history = deque(maxlen=1000)
+        try:
+            if TRADES_FILE.exists():
+                with TRADES_FILE.open("rb") as f:
+                    # 1000 entries at ~150B each — the last 256KB covers
+                    # the cap without scanning the whole log
+                    f.seek(0, os.SEEK_END)
+                    f.seek(max(0, f.tell() - 256_000))
+                    lines = f.read().splitlines()
+                for line in lines[-1000:]:
+                    try:
+                        history.append(orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        continue  # torn first line from the mid-file seek
+        except Exception as e:
+            log.warning("state.trades_load_error", error=str(e))
+        return history
+
 
 class SelfFundingManager:
     """Manages the agent's finances and survival."""
 
+    # Minimum seconds between state flushes — record_trade/record_cycle_cost
+    # can fire many times per cycle, and each save re-serializes the whole
+    # trade history
+    SAVE_INTERVAL = 5.0
+
     def __init__(self, state: AgentState):
         self.state = state
+        self._last_save = 0.0
+        # Whatever was debounced away still lands on clean shutdown
+        atexit.register(self.state.save)
+
+    def _mark_dirty(self):
+        """Persist state, at most once per SAVE_INTERVAL."""
+        now = time.monotonic()
+        if now - self._last_save > self.SAVE_INTERVAL:
+            self.state.save()
+            self._last_save = now
 
     def record_trade(self, pnl: float, api_cost_increment: float):
         """Record a completed trade."""
@@ -78,18 +168,25 @@ class SelfFundingManager:
             self.state.losing_trades += 1
 
         self.state.current_bankroll += pnl - api_cost_increment
-        self.state.trade_history.append({
+        entry = {
             "pnl": pnl,
             "api_cost": api_cost_increment,
             "bankroll_after": self.state.current_bankroll,
             "timestamp": datetime.now(timezone.utc).isoformat(),
-        })
+        }
+        self.state.trade_history.append(entry)
+        self._append_trade_log(entry)
 
-        # Keep only last 1000 trades in history
-        if len(self.state.trade_history) > 1000:
-            self.state.trade_history = self.state.trade_history[-1000:]
+        self._mark_dirty()
 
-        self.state.save()
+    @staticmethod
+    def _append_trade_log(entry: dict):
+        """Append one line to trades.jsonl."""
+        try:
+            with TRADES_FILE.open("ab") as f:
+                f.write(orjson.dumps(entry) + b"\n")
+        except Exception as e:
+            log.warning("state.trade_log_error", error=str(e))
 
     def record_cycle_cost(self, api_cost: float):
         """Record API cost for a scan cycle (even without trades)."""
@@ -97,7 +194,7 @@ class SelfFundingManager:
         self.state.current_bankroll -= api_cost
         self.state.cycles_completed += 1
         self.state.last_cycle_at = datetime.now(timezone.utc).isoformat()
-        self.state.save()
+        self._mark_dirty()
 
     def can_afford_cycle(self) -> bool:
         """Check if agent can afford another scan cycle.
@@ -133,7 +230,7 @@ class SelfFundingManager:
                         drift=f"${drift:.2f}",
                     )
                     self.state.current_bankroll = on_chain
-                    self.state.save()
+                    self._mark_dirty()
         except Exception as e:
             log.warning("funding.sync_failed", error=str(e))
 
@@ -13,11 +13,12 @@ Requires a small amount of MATIC in your wallet for gas fees (~$0.01).
 """
 
 import sys
+import time
 import httpx
 import structlog
-from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from config import config
+from wallet import signer
 from balance import (
     USDC_E_ADDRESS,
     USDC_NATIVE_ADDRESS,
@@ -59,32 +60,53 @@ def _rpc_post(method: str, params: list) -> dict:
     raise ConnectionError("Could not connect to Polygon RPC")
 
 
-def approve_token(account: LocalAccount, token_address: str, spender: str, label: str):
-    """Send an ERC20 approve transaction."""
-    address = _get_wallet_address()
+def _rpc_post_batch(calls: list[tuple[str, list]]) -> list[dict]:
+    """Send several JSON-RPC requests as one batched POST.
+
+    Polygon RPCs accept an array payload and answer all entries in one
+    round-trip; responses are re-sorted by id back into request order.
+    """
+    payload = [
+        {"jsonrpc": "2.0", "method": method, "params": params, "id": i}
+        for i, (method, params) in enumerate(calls)
+    ]
+    for url in POLYGON_RPC_URLS:
+        try:
+            resp = httpx.post(url, json=payload, timeout=30)
+            if resp.status_code == 200:
+                data = resp.json()
+                if isinstance(data, list) and len(data) == len(calls):
+                    return sorted(data, key=lambda d: d.get("id", 0))
+        except Exception:
+            continue
+    raise ConnectionError("Could not connect to Polygon RPC")
+
+
+def approve_token(
+    account: LocalAccount, token_address: str, spender: str, label: str,
+    owner: str, nonce: int, gas_price: int,
+) -> str | None:
+    """Send an ERC20 approve transaction and return its hash.
 
+    Does NOT wait for confirmation — callers collect the hashes and poll
+    all receipts together via wait_for_receipts. nonce and gas_price come
+    from main(), which fetches them once and advances the nonce locally.
+    Returns None if the allowance is already set or the send failed.
+    """
     # Check current allowance first
     from balance import _eth_call, ALLOWANCE_SELECTOR
-    call_data = ALLOWANCE_SELECTOR + _encode_address(address) + _encode_address(spender)
+    call_data = ALLOWANCE_SELECTOR + _encode_address(owner) + _encode_address(spender)
     result = _eth_call(token_address, call_data)
     current_allowance = int(result, 16)
 
     if current_allowance > 2**128:
         print(f"  ✅ {label} — already approved")
-        return
+        return None
 
     # Build approve(spender, MAX_UINT256) transaction data
     amount_hex = hex(MAX_UINT256)[2:].zfill(64)
     tx_data = APPROVE_SELECTOR + _encode_address(spender) + amount_hex
 
-    # Get nonce
-    nonce_result = _rpc_post("eth_getTransactionCount", [account.address, "latest"])
-    nonce = int(nonce_result["result"], 16)
-
-    # Get gas price
-    gas_result = _rpc_post("eth_gasPrice", [])
-    gas_price = int(gas_result["result"], 16)
-
     # Build transaction
     tx = {
         "nonce": nonce,
@@ -106,28 +128,44 @@ def approve_token(account: LocalAccount, token_address: str, spender: str, label
 
     if not tx_hash:
         print(f"  ❌ {label} — send failed: {send_result}")
-        return
+        return None
 
     print(f"  ⏳ {label} — tx sent: {tx_hash}")
+    return tx_hash
+
 
-    # Wait for receipt
-    import time
-    for _ in range(60):
+def wait_for_receipts(pending: list[tuple[str, str]], timeout: float = 120.0):
+    """Wait for all (label, tx_hash) pairs to confirm.
+
+    One batched eth_getTransactionReceipt request per poll tick covers
+    every outstanding transaction, so total wall time is the slowest
+    confirmation rather than the sum of per-tx waits.
+    """
+    deadline = time.time() + timeout
+    while pending and time.time() < deadline:
         time.sleep(2)
         try:
-            receipt_result = _rpc_post("eth_getTransactionReceipt", [tx_hash])
-            receipt = receipt_result.get("result")
-            if receipt:
-                status = int(receipt.get("status", "0x0"), 16)
-                if status == 1:
-                    print(f"  ✅ {label} — approved!")
-                else:
-                    print(f"  ❌ {label} — transaction reverted")
-                return
+            results = _rpc_post_batch(
+                [("eth_getTransactionReceipt", [tx_hash]) for _, tx_hash in pending]
+            )
         except Exception:
-            pass
+            continue
+
+        still_pending = []
+        for (label, tx_hash), res in zip(pending, results):
+            receipt = res.get("result")
+            if not receipt:
+                still_pending.append((label, tx_hash))
+                continue
+            status = int(receipt.get("status", "0x0"), 16)
+            if status == 1:
+                print(f"  ✅ {label} — approved!")
+            else:
+                print(f"  ❌ {label} — transaction reverted")
+        pending = still_pending
 
-    print(f"  ⚠️  {label} — timeout waiting for receipt (tx may still confirm)")
+    for label, tx_hash in pending:
+        print(f"  ⚠️  {label} — timeout waiting for receipt (tx may still confirm)")
 
 
 def main():
@@ -137,7 +175,7 @@ def main():
     print("Polymarket Agent — Token Allowance Setup")
     print("=" * 60)
 
-    account = Account.from_key(config.private_key)
+    account = signer()
     address = _get_wallet_address()
 
     print(f"\n🔑 Signer: {account.address}")
@@ -165,12 +203,31 @@ def main():
         (USDC_NATIVE_ADDRESS, NEG_RISK_ADAPTER, "USDC → Neg Risk Adapter"),
     ]
 
+    # Fetch nonce and gas price once — the loop advances the nonce locally
+    # instead of paying two metadata round-trips per approval. "pending"
+    # accounts for any unmined transactions already in the pool.
+    nonce = int(
+        _rpc_post("eth_getTransactionCount", [account.address, "pending"])["result"], 16
+    )
+    gas_price = int(_rpc_post("eth_gasPrice", [])["result"], 16)
+
+    # Phase 1: send every approval, collecting tx hashes
+    pending = []
     for token, spender, label in approvals:
         try:
-            approve_token(account, token, spender, label)
+            tx_hash = approve_token(
+                account, token, spender, label, address, nonce, gas_price
+            )
+            if tx_hash:
+                pending.append((label, tx_hash))
+                nonce += 1  # only consumed when a tx was actually sent
         except Exception as e:
             print(f"  ❌ {label} — error: {e}")
 
+    # Phase 2: poll all receipts together, one batched request per tick
+    if pending:
+        wait_for_receipts(pending)
+
     print("\n✅ Done! Verifying allowances...\n")
     allowances = check_allowances()
     all_ok = True
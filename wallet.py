@@ -0,0 +1,21 @@
+"""
+Wallet: the agent's signing account, derived once and shared.
+
+Account.from_key parses and validates the hex key, derives the secp256k1
+public key, and Keccak-hashes it into an address — work that several
+modules (balance, setup_allowances, executor) were repeating. Derive the
+LocalAccount a single time and hand out the cached instance.
+"""
+
+from functools import lru_cache
+
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+
+from config import config
+
+
+@lru_cache(maxsize=1)
+def signer() -> LocalAccount:
+    """The agent's LocalAccount, derived once from the configured key."""
+    return Account.from_key(config.private_key)